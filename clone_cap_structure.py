@@ -1,25 +1,38 @@
 #!/usr/bin/env python3
 """
 Script para clonar la estructura del export.tar.gz al proyecto CAP
-Descomprime los archivos necesarios y genera el schema.cds usando table.xml
+Lee los archivos necesarios del tar.gz y genera el schema.cds usando table.xml
 """
 
+import hashlib
+import io
+import itertools
+import json
 import os
 import re
-import tarfile
-import xml.etree.ElementTree as ET
+import shutil
 from pathlib import Path
-from collections import OrderedDict
-from utils import get_schema_name, get_cap_project_dir
+from concurrent.futures import ProcessPoolExecutor
+from utils import get_schema_name, get_cap_project_dir, open_tar_gz, buffered_stdout, USE_COLOR
+
+# lxml es un parser en C mucho más rápido; si no está instalado se usa la stdlib
+try:
+    from lxml import etree as ET
+    XML_PARSER_ACCELERATED = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    # ElementTree usa su acelerador en C (_elementtree) salvo en entornos restringidos,
+    # donde cae silenciosamente a la implementación en Python puro
+    XML_PARSER_ACCELERATED = ET.Element is not getattr(ET, '_Element_Py', None)
 
 
 class Colors:
-    """Colores para output en terminal"""
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    BLUE = '\033[0;34m'
-    NC = '\033[0m'  # No Color
+    """Colores para output en terminal (vacíos si la salida no es una terminal o con NO_COLOR)"""
+    RED = '\033[0;31m' if USE_COLOR else ''
+    GREEN = '\033[0;32m' if USE_COLOR else ''
+    YELLOW = '\033[1;33m' if USE_COLOR else ''
+    BLUE = '\033[0;34m' if USE_COLOR else ''
+    NC = '\033[0m' if USE_COLOR else ''  # No Color
 
 
 # Mapeo de tipos HANA (desde create.sql) a tipos CDS
@@ -50,73 +63,106 @@ HANA_TYPE_TO_CDS = {
     'BOOLEAN': 'Boolean',
 }
 
+# Patrones precompilados para parsear create.sql (operan sobre bytes, sin decodificar el archivo)
+# Cabecera del CREATE TABLE hasta el paréntesis que abre la definición de columnas
+CREATE_TABLE_HEAD_RE = re.compile(rb'CREATE\s+COLUMN\s+TABLE\s+[^(]+\(', re.IGNORECASE)
+# Paréntesis o literales entre comillas (los paréntesis dentro de literales no cuentan)
+PAREN_TOKEN_RE = re.compile(rb'[()]|\'[^\']*\'|"[^"]*"')
+# Definición de columna: "COLUMN_NAME" TYPE(LENGTH)
+COLUMN_DEF_RE = re.compile(rb'["\']([A-Z_$][A-Z0-9_$]*?)["\']\s+([A-Z]+)(?:\(([^)]+)\))?', re.IGNORECASE)
+# Atributos de una columna en una sola pasada: IDENTITY, NOT NULL o DEFAULT
+# (valor entre comillas simples, dobles o palabra suelta excepto "AS", sin las comillas)
+COLUMN_ATTR_RE = re.compile(
+    rb'(?P<identity>\bGENERATED\s+(?:ALWAYS|BY\s+DEFAULT)\s+AS\s+IDENTITY\b)'
+    rb'|(?P<not_null>\bNOT\s+NULL\b)'
+    rb'|\bDEFAULT\s+(?:\'(?P<default_sq>[^\']*)\'|"(?P<default_dq>[^"]*)"|(?!AS\b)(?P<default_bare>[^\s,)]+))',
+    re.IGNORECASE
+)
+
+# Caché de entidades CDS generadas, por hash del contenido de table.xml + create.sql
+# (se guarda en el directorio de extracción; cambiar la versión invalida las entradas)
+CDS_CACHE_FILE = '.cds_cache.json'
+CDS_CACHE_VERSION = 1
+
+# Palabras reservadas que el patrón de columnas puede capturar como nombre
+RESERVED_WORDS = frozenset({'PRIMARY', 'KEY', 'INVERTED', 'VALUE', 'UNLOAD', 'PRIORITY', 'AUTO', 'MERGE'})
 
-def map_hana_type_to_cds(hana_type):
-    """Mapea un tipo HANA (string) a un tipo CDS"""
-    hana_type_upper = hana_type.upper()
-    return HANA_TYPE_TO_CDS.get(hana_type_upper, 'String')
+
+def find_columns_section(create_sql_content):
+    """
+    Retorna el contenido entre el paréntesis que abre la definición de columnas y su cierre
+    Recorre el texto una sola vez contando la profundidad de paréntesis
+    """
+    head = CREATE_TABLE_HEAD_RE.search(create_sql_content)
+    if not head:
+        return None
+    
+    start = head.end()
+    depth = 1
+    for token in PAREN_TOKEN_RE.finditer(create_sql_content, start):
+        char = token.group()
+        if char == b'(':
+            depth += 1
+        elif char == b')':
+            depth -= 1
+            if depth == 0:
+                return create_sql_content[start:token.start()]
+    
+    # Sin paréntesis de cierre: usar el resto del statement
+    return create_sql_content[start:]
 
 
 def parse_create_sql(create_sql_content):
-    """Parsea un CREATE TABLE statement y extrae información de columnas"""
-    columns_info = OrderedDict()
+    """Parsea un CREATE TABLE statement (bytes) y extrae información de columnas"""
+    columns_info = {}
     
     # Extraer la sección de definición de columnas
-    # Buscar desde el primer paréntesis hasta PRIMARY KEY
-    match = re.search(r'CREATE\s+COLUMN\s+TABLE\s+[^(]+\((.+?)\)\s*(?:PRIMARY|UNLOAD|AUTO|MERGE|$)', create_sql_content, re.IGNORECASE | re.DOTALL)
-    if not match:
+    columns_section = find_columns_section(create_sql_content)
+    if not columns_section:
         return columns_info
     
-    columns_section = match.group(1)
+    # Referencias locales para el loop (LOAD_FAST en lugar de LOAD_GLOBAL)
+    map_type = HANA_TYPE_TO_CDS.get
+    reserved_words = RESERVED_WORDS
+    find_attrs = COLUMN_ATTR_RE.finditer
     
     # Buscar cada definición de columna: "COLUMN_NAME" TYPE(LENGTH) [NOT NULL] [GENERATED ... AS IDENTITY] [DEFAULT value]
-    # Patrón mejorado para capturar nombre, tipo y opciones
-    column_pattern = r'["\']([A-Z_$][A-Z0-9_$]*?)["\']\s+([A-Z]+)(?:\(([^)]+)\))?'
-    
-    matches = list(re.finditer(column_pattern, columns_section, re.IGNORECASE))
-    for match in matches:
-        col_name = match.group(1).upper()
-        col_type = match.group(2).upper()
-        col_length = match.group(3) if match.group(3) else None
+    matches = list(COLUMN_DEF_RE.finditer(columns_section))
+    for i, match in enumerate(matches):
+        # Solo se decodifican los grupos capturados (nombre y tipo son ASCII)
+        col_name = match.group(1).decode('ascii').upper()
+        col_type = match.group(2).decode('ascii').upper()
+        col_length = match.group(3).decode('ascii', errors='ignore') if match.group(3) else None
         
         # Filtrar palabras reservadas
-        reserved_words = {'PRIMARY', 'KEY', 'INVERTED', 'VALUE', 'UNLOAD', 'PRIORITY', 'AUTO', 'MERGE'}
         if col_name in reserved_words:
             continue
         
         # Buscar información después de esta columna (hasta la siguiente columna o fin)
         start_pos = match.end()
-        next_match_start = len(columns_section)
-        if matches.index(match) < len(matches) - 1:
-            next_match_start = matches[matches.index(match) + 1].start()
+        next_match_start = matches[i + 1].start() if i + 1 < len(matches) else len(columns_section)
         
         remaining = columns_section[start_pos:next_match_start]
         
-        # Verificar si tiene GENERATED ... AS IDENTITY (no debe tener default)
-        has_identity = bool(re.search(r'\bGENERATED\s+(?:ALWAYS|BY\s+DEFAULT)\s+AS\s+IDENTITY\b', remaining, re.IGNORECASE))
-        
-        # Buscar NOT NULL
-        is_not_null = bool(re.search(r'\bNOT\s+NULL\b', remaining, re.IGNORECASE))
-        
-        # Buscar DEFAULT (solo si no es IDENTITY)
+        # Recorrer los atributos de la columna una sola vez
+        has_identity = False
+        is_not_null = False
         default_value = None
-        if not has_identity:
-            # Buscar DEFAULT seguido de un valor numérico o string
-            # Patrón: DEFAULT seguido de número, string entre comillas, o palabra (pero no "AS")
-            default_match = re.search(r'\bDEFAULT\s+([^\s,)]+)(?:\s+(?:NOT\s+NULL|AS))?', remaining, re.IGNORECASE)
-            if default_match:
-                default_val = default_match.group(1).strip()
-                # Filtrar "AS" si está presente
-                if default_val.upper() != 'AS':
-                    # Remover comillas si las tiene
-                    if default_val.startswith("'") and default_val.endswith("'"):
-                        default_val = default_val[1:-1]
-                    elif default_val.startswith('"') and default_val.endswith('"'):
-                        default_val = default_val[1:-1]
-                    default_value = default_val
+        for attr in find_attrs(remaining):
+            kind = attr.lastgroup
+            if kind == 'identity':
+                has_identity = True
+            elif kind == 'not_null':
+                is_not_null = True
+            elif default_value is None:
+                default_value = attr.group(kind).decode('utf-8', errors='ignore').strip()
         
-        # Mapear tipo
-        cds_type = map_hana_type_to_cds(col_type)
+        # Si es GENERATED ... AS IDENTITY no debe tener default
+        if has_identity:
+            default_value = None
+        
+        # Mapear tipo (col_type ya está en mayúsculas: lookup directo)
+        cds_type = map_type(col_type, 'String')
         
         columns_info[col_name] = {
             'type': cds_type,
@@ -128,68 +174,78 @@ def parse_create_sql(create_sql_content):
     return columns_info
 
 
-def parse_table_xml(xml_content):
-    """Parsea un archivo table.xml y extrae información adicional (claves primarias, NOT NULL)"""
-    try:
-        root = ET.fromstring(xml_content)
+def is_not_null_constr(constr_text, col_name, primary_keys):
+    """Determina si el valor Constr de table.xml indica NOT NULL"""
+    # Si es parte de la clave primaria, es NOT NULL implícitamente (no hace falta parsear Constr)
+    if col_name in primary_keys:
+        return True
+    constr = int(constr_text) if constr_text else 0
+    # Constr 26 (0x1A) o cualquier valor con bit 1 (0x02) indica NOT NULL
+    return (constr & 2) != 0 or (constr == 26)
+
+
+def parse_table_xml(xml_content, known_not_null=frozenset()):
+    """
+    Parsea un archivo table.xml (bytes) y extrae información adicional (claves primarias, NOT NULL)
+    Usa una sola pasada con iterparse, liberando cada Field ya procesado
+    Las columnas de known_not_null (ya NOT NULL según create.sql) no necesitan evaluar Constr
+    Los errores de parseo se propagan: process_table los devuelve en su resultado
+    """
+    table_name = None
+    primary_keys = []
+    column_constraints = {}
+    # Se guarda el Constr crudo: KeyAttrs puede aparecer después de AllAttrs
+    raw_constraints = {}
+    path = []
+    
+    for event, elem in ET.iterparse(io.BytesIO(xml_content), events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
         
-        # Nombre de la tabla
-        name_elem = root.find('Name')
-        table_name = name_elem.text if name_elem is not None else None
+        path.pop()
+        parent = path[-1] if path else None
         
+        # Nombre de la tabla (hijo directo de la raíz)
+        if elem.tag == 'Name' and len(path) == 1:
+            table_name = elem.text
         # Claves primarias
-        key_attrs = root.find('KeyAttrs')
-        primary_keys = []
-        if key_attrs is not None:
-            for name_elem in key_attrs.findall('Name'):
-                primary_keys.append(name_elem.text.upper())
-        
+        elif elem.tag == 'Name' and parent == 'KeyAttrs':
+            primary_keys.append(elem.text.upper())
         # Información adicional de columnas (NOT NULL principalmente)
-        all_attrs = root.find('AllAttrs')
-        column_constraints = {}
-        
-        if all_attrs is not None:
-            for field in all_attrs.findall('Field'):
-                name_elem = field.find('Name')
-                if name_elem is None:
-                    continue
-                
+        elif elem.tag == 'Field' and parent == 'AllAttrs':
+            name_elem = elem.find('Name')
+            if name_elem is not None:
                 col_name = name_elem.text.upper()
-                
+                # Columnas ya NOT NULL según create.sql: no hace falta evaluar Constr
+                if col_name in known_not_null:
+                    column_constraints[col_name] = {'not_null': True}
                 # Filtrar columnas del sistema
-                if col_name.startswith('$'):
-                    continue
-                
-                # Verificar NOT NULL (Constr)
-                constr_elem = field.find('Constr')
-                is_not_null = False
-                if constr_elem is not None:
-                    constr = int(constr_elem.text) if constr_elem.text else 0
-                    # Constr 26 (0x1A) o cualquier valor con bit 1 (0x02) indica NOT NULL
-                    # También si es parte de la clave primaria, es NOT NULL implícitamente
-                    is_not_null = (constr & 2) != 0 or (constr == 26) or col_name in primary_keys
-                
-                column_constraints[col_name] = {
-                    'not_null': is_not_null
-                }
-        
-        return {
-            'name': table_name,
-            'primary_keys': primary_keys,
-            'column_constraints': column_constraints
+                elif not col_name.startswith('$'):
+                    constr_elem = elem.find('Constr')
+                    # None = sin Constr; '' = Constr vacío (cuenta como 0)
+                    raw_constraints[col_name] = (constr_elem.text or '') if constr_elem is not None else None
+            elem.clear()
+    
+    pk_set = frozenset(primary_keys)
+    for col_name, constr_text in raw_constraints.items():
+        column_constraints[col_name] = {
+            'not_null': constr_text is not None and is_not_null_constr(constr_text, col_name, pk_set)
         }
-    except Exception as e:
-        print(f"  {Colors.YELLOW}⚠ Error parseando XML: {e}{Colors.NC}")
-        return None
+    
+    return {
+        'name': table_name,
+        'primary_keys': primary_keys,
+        'column_constraints': column_constraints
+    }
 
 
 def generate_cds_entity(table_info):
-    """Genera el código CDS para una entidad"""
+    """Genera el código CDS para una entidad, línea por línea"""
     if not table_info or not table_info.get('columns'):
-        return None
+        return
     
-    lines = []
-    lines.append(f"entity {table_info['name']} {{")
+    yield f"entity {table_info['name']} {{"
     
     # Agregar columnas
     for col_name, col_info in table_info['columns'].items():
@@ -212,63 +268,126 @@ def generate_cds_entity(table_info):
             line += f" default {default_val}"
         
         line += ";"
-        lines.append(line)
-    
-    lines.append("}")
-    
-    return "\n".join(lines)
-
-
-def check_files_exist(extract_dir, required_files):
-    """Verifica si todos los archivos requeridos ya existen"""
-    if not extract_dir.exists():
-        return False
-    
-    missing_files = []
-    for file_path in required_files:
-        full_path = extract_dir / file_path
-        if not full_path.exists():
-            missing_files.append(file_path)
+        yield line
     
-    return len(missing_files) == 0
+    yield "}"
 
 
-def extract_files_from_tar(tar_path, extract_dir, schema_name):
-    """Extrae todos los archivos necesarios del tar.gz (excepto CSV)"""
-    # Primero, obtener lista de archivos requeridos
-    required_files = []
+def read_table_files_from_tar(tar_path, schema_name):
+    """
+    Lee table.xml y create.sql de cada tabla directamente desde el tar.gz (sin escribir a disco)
+    Retorna un diccionario {directorio_tabla: {'table.xml': bytes, 'create.sql': bytes}}
+    """
     schema_path = f'index/{schema_name}/'
+    table_files = {}
+    print(f"{Colors.BLUE}Leyendo archivos del export.tar.gz...{Colors.NC}")
     try:
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            for member in tar.getmembers():
-                if schema_path in member.name:
-                    if not member.name.endswith('/data.csv'):
-                        required_files.append(member.name)
+        # Modo streaming: una sola pasada de descompresión sobre el tar.gz
+        with open_tar_gz(tar_path) as tar:
+            for member in tar:
+                if not member.isfile() or schema_path not in member.name:
+                    continue
+                table_dir, _, filename = member.name.rpartition('/')
+                if filename not in ('table.xml', 'create.sql'):
+                    continue
+                table_files.setdefault(table_dir, {})[filename] = tar.extractfile(member).read()
     except Exception as e:
         print(f"  {Colors.RED}✗ Error leyendo tar.gz: {e}{Colors.NC}")
-        return []
-    
-    # Verificar si ya existen todos los archivos
-    if check_files_exist(extract_dir, required_files):
-        print(f"{Colors.BLUE}Archivos ya descomprimidos, usando existentes...{Colors.NC}")
-        print(f"  {Colors.GREEN}✓ {len(required_files)} archivos encontrados{Colors.NC}\n")
-        return required_files
+        return {}
     
-    # Si no existen, extraer
-    print(f"{Colors.BLUE}Extrayendo archivos del export.tar.gz...{Colors.NC}")
-    extracted_files = []
+    file_count = sum(len(files) for files in table_files.values())
+    print(f"  {Colors.GREEN}✓ Leídos {file_count} archivos{Colors.NC}\n")
+    return table_files
+
+
+def table_content_hash(xml_content, create_sql_content):
+    """Hash del contenido de una tabla (clave de la caché de entidades)"""
+    digest = hashlib.blake2b(xml_content, digest_size=16)
+    digest.update(b'\0')
+    digest.update(create_sql_content or b'')
+    return digest.hexdigest()
+
+
+def load_cds_cache(cache_path):
+    """Carga la caché de entidades CDS; retorna un diccionario vacío si no existe o no es válida"""
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != CDS_CACHE_VERSION:
+        return {}
+    return data.get('entities', {})
+
+
+def save_cds_cache(cache_path, entities):
+    """Guarda la caché de entidades CDS"""
     try:
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            for member in tar.getmembers():
-                if member.name in required_files:
-                    # Extraer archivo
-                    tar.extract(member, extract_dir)
-                    extracted_files.append(member.name)
-        print(f"  {Colors.GREEN}✓ Extraídos {len(extracted_files)} archivos{Colors.NC}\n")
-        return extracted_files
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({'version': CDS_CACHE_VERSION, 'entities': entities}), encoding='utf-8')
+    except OSError as e:
+        print(f"  {Colors.YELLOW}⚠ No se pudo guardar la caché: {e}{Colors.NC}")
+
+
+def process_table(task):
+    """
+    Procesa una tabla (table.xml + create.sql) y genera su entidad CDS
+    Recibe una tupla (table_name, xml_content, create_sql_content) para poder ejecutarse en otro proceso
+    """
+    table_name, xml_content, create_sql_content = task
+    try:
+        if create_sql_content is None:
+            return {'success': False, 'warning': True, 'error': 'No se encontró create.sql'}
+        
+        # Parsear create.sql para obtener tipos de datos
+        columns_from_sql = parse_create_sql(create_sql_content)
+        
+        # Parsear XML para obtener información adicional (claves primarias, NOT NULL)
+        # Las columnas ya NOT NULL en create.sql no necesitan evaluar Constr
+        known_not_null = frozenset(col_name for col_name, col_info in columns_from_sql.items() if col_info['not_null'])
+        try:
+            xml_info = parse_table_xml(xml_content, known_not_null)
+        except Exception as e:
+            # El detalle se muestra desde el proceso principal, junto a la tabla
+            return {'success': False, 'warning': True, 'error': 'No se pudo parsear table.xml',
+                    'details': [f'Error parseando XML: {e}']}
+        
+        # Combinar información: tipos desde SQL, constraints desde XML
+        primary_keys = xml_info['primary_keys']
+        pk_set = frozenset(primary_keys)
+        xml_constraints = xml_info['column_constraints']
+        
+        # Si es IDENTITY, no debe tener default (HANA lo maneja automáticamente)
+        # Para otros campos, mapear el default si existe (especialmente DEFAULT 0)
+        combined_columns = {
+            col_name: {
+                'type': col_info['type'],
+                'not_null': col_info['not_null'] or col_name in pk_set or xml_constraints.get(col_name, {}).get('not_null', False),
+                'default': None if col_info['is_identity'] else col_info['default'],
+                'is_key': col_name in pk_set
+            }
+            for col_name, col_info in columns_from_sql.items()
+        }
+        
+        # Crear table_info combinado
+        table_info = {
+            'name': xml_info['name'],
+            'columns': combined_columns,
+            'primary_keys': primary_keys
+        }
+        
+        # Generar entidad CDS (como lista de líneas para poder devolverla al proceso principal)
+        entity_lines = list(generate_cds_entity(table_info))
+        if not entity_lines:
+            return {'success': False, 'warning': True, 'error': 'No se pudo generar entidad CDS'}
+        
+        return {
+            'success': True,
+            'entity': entity_lines,
+            'columns': len(table_info['columns']),
+            'keys': len(table_info['primary_keys'])
+        }
     except Exception as e:
-        print(f"  {Colors.RED}✗ Error extrayendo archivos: {e}{Colors.NC}")
-        return []
+        return {'success': False, 'error': str(e)}
 
 
 def main():
@@ -284,7 +403,7 @@ def main():
     cap_project_dir = get_cap_project_dir(script_dir)
     # El proyecto CAP está al mismo nivel que schema_to_cap
     schema_file = base_dir / cap_project_dir / "db" / "schema.cds"
-    # Los archivos temporales y el tar.gz están en schema_to_cap
+    # El tar.gz está en schema_to_cap (temp_extract se usa para auto-detectar el schema y guardar la caché)
     extract_dir = script_dir / os.environ.get('EXTRACT_DIR', 'temp_extract')
     tar_path = script_dir / tar_filename
     
@@ -297,9 +416,6 @@ def main():
         print(f"{Colors.RED}Error: No se encontró {tar_path}{Colors.NC}")
         return 1
     
-    # Crear directorio de extracción
-    extract_dir.mkdir(exist_ok=True)
-    
     # Obtener nombre del schema (auto-detectado o configurado)
     schema_name = get_schema_name(tar_path=tar_path, extract_dir=extract_dir)
     if not schema_name:
@@ -309,136 +425,111 @@ def main():
     
     print(f"{Colors.BLUE}Usando schema: {schema_name}{Colors.NC}\n")
     
+    if not XML_PARSER_ACCELERATED:
+        print(f"{Colors.YELLOW}⚠ ElementTree sin acelerador en C: el parseo de table.xml será lento (instala lxml){Colors.NC}\n")
+    
     # Crear backup del schema.cds si existe
     if schema_file.exists():
         backup_file = schema_file.with_suffix('.cds.backup')
         print(f"{Colors.BLUE}Creando backup de schema.cds...{Colors.NC}")
-        backup_file.write_text(schema_file.read_text(encoding='utf-8'), encoding='utf-8')
+        shutil.copyfile(schema_file, backup_file)
         print(f"  {Colors.GREEN}✓ Backup creado: {backup_file}{Colors.NC}\n")
     
-    # Extraer archivos necesarios
-    extracted_files = extract_files_from_tar(tar_path, extract_dir, schema_name)
+    # Leer los archivos necesarios en memoria
+    table_files = read_table_files_from_tar(tar_path, schema_name)
     
-    if not extracted_files:
-        print(f"{Colors.RED}No se encontraron archivos para extraer{Colors.NC}")
+    if not table_files:
+        print(f"{Colors.RED}No se encontraron archivos en el export.tar.gz{Colors.NC}")
         return 1
     
-    # Obtener lista de tablas (desde los table.xml)
-    table_xml_files = [f for f in extracted_files if f.endswith('/table.xml')]
-    table_xml_files.sort()
+    # Obtener lista de tablas (las que tienen table.xml)
+    table_dirs = sorted(d for d, files in table_files.items() if 'table.xml' in files)
     
-    print(f"{Colors.BLUE}Procesando {len(table_xml_files)} tablas...{Colors.NC}\n")
+    print(f"{Colors.BLUE}Procesando {len(table_dirs)} tablas...{Colors.NC}\n")
     
     # Procesar cada tabla
     entities = []
     success_count = 0
     error_count = 0
     
-    for idx, xml_file_path in enumerate(table_xml_files, 1):
-        table_name = xml_file_path.split('/')[3]  # Extraer nombre de tabla
-        print(f"{Colors.YELLOW}[{idx}/{len(table_xml_files)}] Procesando: {table_name}{Colors.NC}")
-        
-        try:
-            # Leer table.xml y create.sql
-            xml_file = extract_dir / xml_file_path
-            create_sql_file = extract_dir / xml_file_path.replace('/table.xml', '/create.sql')
+    # Las tablas ya procesadas con el mismo contenido se toman de la caché
+    cache_path = extract_dir / CDS_CACHE_FILE
+    cds_cache = load_cds_cache(cache_path)
+    # Solo se conservan las entradas de las tablas actuales
+    new_cache = {}
+    cached_count = 0
+    
+    tasks = []
+    hashes = []
+    for table_dir in table_dirs:
+        files = table_files[table_dir]
+        table_name = table_dir.split('/')[3]  # Extraer nombre de tabla
+        tasks.append((table_name, files['table.xml'], files.get('create.sql')))
+        hashes.append(table_content_hash(files['table.xml'], files.get('create.sql')))
+    
+    # Las tablas pendientes son independientes: se procesan en paralelo y se reportan en orden
+    pending = [task for task, content_hash in zip(tasks, hashes) if content_hash not in cds_cache]
+    
+    # La salida del loop se escribe por bloques, con un solo flush al final
+    with buffered_stdout(), ProcessPoolExecutor() as executor:
+        pending_results = executor.map(process_table, pending, chunksize=8)
+        for idx, ((table_name, _, _), content_hash) in enumerate(zip(tasks, hashes), 1):
+            print(f"{Colors.YELLOW}[{idx}/{len(tasks)}] Procesando: {table_name}{Colors.NC}")
             
-            if not xml_file.exists():
-                print(f"  {Colors.YELLOW}⚠ No se encontró table.xml{Colors.NC}")
-                error_count += 1
-                continue
+            result = cds_cache.get(content_hash)
+            if result is not None:
+                cached_count += 1
+            else:
+                result = next(pending_results)
             
-            if not create_sql_file.exists():
-                print(f"  {Colors.YELLOW}⚠ No se encontró create.sql{Colors.NC}")
-                error_count += 1
-                continue
+            # Advertencias de la tabla, en orden junto a su línea de progreso
+            for detail in result.get('details', ()):
+                print(f"  {Colors.YELLOW}⚠ {detail}{Colors.NC}")
             
-            xml_content = xml_file.read_text(encoding='utf-8', errors='ignore')
-            create_sql_content = create_sql_file.read_text(encoding='utf-8', errors='ignore')
-            
-            # Parsear create.sql para obtener tipos de datos
-            columns_from_sql = parse_create_sql(create_sql_content)
-            
-            # Parsear XML para obtener información adicional (claves primarias, NOT NULL)
-            xml_info = parse_table_xml(xml_content)
-            if not xml_info:
-                print(f"  {Colors.YELLOW}⚠ No se pudo parsear table.xml{Colors.NC}")
+            if result['success']:
+                # Un resultado con advertencias no se guarda en caché: se vuelve a reportar
+                if not result.get('details'):
+                    new_cache[content_hash] = result
+                entities.append(result['entity'])
+                success_count += 1
+                print(f"  {Colors.GREEN}✓ Procesada ({result['columns']} columnas, {result['keys']} keys){Colors.NC}")
+            elif result.get('warning'):
                 error_count += 1
-                continue
-            
-            # Combinar información: tipos desde SQL, constraints desde XML
-            combined_columns = OrderedDict()
-            primary_keys = xml_info['primary_keys']
-            
-            for col_name, col_info in columns_from_sql.items():
-                # Obtener constraints desde XML si existen
-                xml_constraints = xml_info['column_constraints'].get(col_name, {})
-                
-                # Si es IDENTITY, no debe tener default (HANA lo maneja automáticamente)
-                # Para otros campos, mapear el default si existe (especialmente DEFAULT 0)
-                default_value = None
-                if not col_info.get('is_identity', False):
-                    default_value = col_info.get('default')
-                
-                combined_columns[col_name] = {
-                    'type': col_info['type'],
-                    'not_null': col_info['not_null'] or xml_constraints.get('not_null', False) or (col_name in primary_keys),
-                    'default': default_value,
-                    'is_key': col_name in primary_keys
-                }
-            
-            # Crear table_info combinado
-            table_info = {
-                'name': xml_info['name'],
-                'columns': combined_columns,
-                'primary_keys': primary_keys
-            }
-            
-            # Generar entidad CDS
-            cds_entity = generate_cds_entity(table_info)
-            if not cds_entity:
-                print(f"  {Colors.YELLOW}⚠ No se pudo generar entidad CDS{Colors.NC}")
+                print(f"  {Colors.YELLOW}⚠ {result['error']}{Colors.NC}")
+            else:
                 error_count += 1
-                continue
-            
-            entities.append(cds_entity)
-            
-            success_count += 1
-            print(f"  {Colors.GREEN}✓ Procesada ({len(table_info['columns'])} columnas, {len(table_info['primary_keys'])} keys){Colors.NC}")
-            
-        except Exception as e:
-            error_count += 1
-            print(f"  {Colors.RED}✗ Error: {str(e)}{Colors.NC}")
+                print(f"  {Colors.RED}✗ Error: {result['error']}{Colors.NC}")
+    
+    save_cds_cache(cache_path, new_cache)
     
     # Generar schema.cds completo
     print(f"\n{Colors.BLUE}Generando schema.cds...{Colors.NC}")
     
-    schema_content = []
-    schema_content.append("namespace db;")
-    schema_content.append("")
-    schema_content.append("using {cuid} from '@sap/cds/common';")
-    schema_content.append("")
-    
-    # Agregar todas las entidades
-    for entity in entities:
-        schema_content.append(entity)
-        schema_content.append("")
+    header_lines = [
+        "namespace db;",
+        "",
+        "using {cuid} from '@sap/cds/common';",
+        "",
+    ]
+    # Cada entidad va seguida de una línea en blanco
+    entity_lines = (itertools.chain(entity, ("",)) for entity in entities)
     
-    # Escribir archivo
+    # Escribir archivo en una sola escritura
     schema_file.parent.mkdir(parents=True, exist_ok=True)
-    schema_file.write_text("\n".join(schema_content), encoding='utf-8')
+    with schema_file.open('w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write("\n".join(itertools.chain(header_lines, *entity_lines)))
     
     print(f"  {Colors.GREEN}✓ Schema generado: {schema_file}{Colors.NC}")
     
     # Resumen
     print()
     print(f"{Colors.YELLOW}=== Resumen ==={Colors.NC}")
-    print(f"Total de tablas: {len(table_xml_files)}")
+    print(f"Total de tablas: {len(table_dirs)}")
     print(f"{Colors.GREEN}Exitosas: {success_count}{Colors.NC}")
     print(f"{Colors.RED}Con errores: {error_count}{Colors.NC}")
     print(f"Entidades generadas: {len(entities)}")
+    print(f"Desde caché: {cached_count}")
     print()
-    print(f"Archivos descomprimidos en: {extract_dir}")
     print(f"Schema generado en: {schema_file}")
     
     if error_count == 0:
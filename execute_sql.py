@@ -5,66 +5,171 @@ Uso: python3 execute_sql.py [archivo.sql]
 Si no se especifica archivo, ejecuta todos los archivos .sql del directorio
 """
 
+import decimal
+import errno
+import functools
+import hashlib
+import io
+import mmap
+import multiprocessing.util
 import os
+import queue
+import re
 import sys
+import shutil
+import subprocess
+import tempfile
 import time
 import glob
 import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, redirect_stdout
 from datetime import datetime
 from pathlib import Path
 
+from utils import load_config_file, buffered_stdout, USE_COLOR
+
+# hdbcli es opcional: si está instalado se usa una única conexión persistente
+# con INSERTs por lotes; si no, se recurre a hdbsql
+try:
+    from hdbcli import dbapi
+except ImportError:
+    dbapi = None
+
 class Colors:
-    """Colores para output en terminal"""
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    BLUE = '\033[0;34m'
-    NC = '\033[0m'  # No Color
+    """Colores para output en terminal (vacíos si la salida no es una terminal o con NO_COLOR)"""
+    RED = '\033[0;31m' if USE_COLOR else ''
+    GREEN = '\033[0;32m' if USE_COLOR else ''
+    YELLOW = '\033[1;33m' if USE_COLOR else ''
+    BLUE = '\033[0;34m' if USE_COLOR else ''
+    NC = '\033[0m' if USE_COLOR else ''  # No Color
+
+
+# Directorio del script (schema_to_cap)
+SCRIPT_DIR = Path(__file__).parent
+
+# hdbsql en el PATH del sistema, resuelto una sola vez al importar
+HDBSQL_ON_PATH = shutil.which('hdbsql')
+
+# Cantidad máxima de filas enviadas en cada executemany
+INSERT_BATCH_SIZE = 10000
+
+# Archivos ejecutados en paralelo si no se configura SQL_WORKERS (1 = secuencial)
+DEFAULT_SQL_WORKERS = 1
+
+# Conexión hdbcli propia de cada proceso worker (ver init_worker)
+WORKER_CONN = None
+
+# Registro (en el directorio de logs) de los archivos ejecutados correctamente
+PROCESSED_MANIFEST = 'processed.manifest'
+
+# Tamaño de bloque al leer los archivos SQL por streaming
+SQL_READ_CHUNK_SIZE = 1 << 20
+
+# Tokens relevantes para dividir un script en statements: literales, comentarios y ';'
+# (un literal sin cerrar llega hasta el final del bloque leído)
+SQL_STATEMENT_TOKEN_RE = re.compile(rb"'[^']*(?:''[^']*)*(?:'|\Z)|\"[^\"]*(?:\"|\Z)|--[^\n]*|;")
+
+# INSERT INTO <tabla> [(<columnas>)] VALUES (<valores>)
+INSERT_VALUES_RE = re.compile(
+    r'INSERT\s+INTO\s+(?P<table>(?:"[^"]+"|\w+)(?:\s*\.\s*(?:"[^"]+"|\w+))?)\s*'
+    r'(?P<columns>\([^)]*\))?\s*VALUES\s*\((?P<values>.*)\)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Líneas no comentadas que contienen INSERT INTO (como mucho una coincidencia por línea)
+INSERT_COUNT_BYTES_RE = re.compile(rb'^(?![^\S\n]*--)[^\n]*?INSERT[^\S\n]+INTO', re.IGNORECASE | re.MULTILINE)
+
+# La misma línea de INSERT con su tabla: "SCHEMA"."TABLE", SCHEMA.TABLE o TABLE/"TABLE".
+# La primera coincidencia está al inicio del archivo, sin recorrerlo entero
+INSERT_TARGET_RE = re.compile(
+    rb'^(?![^\S\n]*--)[^\n]*?INSERT[^\S\n]+INTO'
+    rb'(?:\s+(?:"([^"]+)"\s*\.\s*"([^"]+)"|(\w+)\s*\.\s*(\w+)|"?(\w+)"?))?',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Timeout de hdbsql si no se configura SQL_TIMEOUT: mínimo y segundos por INSERT del archivo
+SQL_TIMEOUT_MIN_SECONDS = 600
+SQL_TIMEOUT_PER_INSERT = 0.1
+
+# Intervalo del monitoreo de progreso (segundos): mínimo, máximo mientras la tabla crece
+# y máximo cuando el conteo no cambia entre consultas
+PROGRESS_MIN_INTERVAL = 0.5
+PROGRESS_MAX_INTERVAL = 10
+PROGRESS_IDLE_MAX_INTERVAL = 30
+
+# Marca que cierra cada consulta enviada a una sesión hdbsql persistente
+HDBSQL_SESSION_MARKER = 'END_OF_QUERY'
+
+# Tiempo máximo de espera (segundos) de la respuesta de cada consulta en la sesión hdbsql
+HDBSQL_SESSION_TIMEOUT = 60
 
+# Error de HANA al insertar un registro duplicado
+UNIQUE_VIOLATION_RE = re.compile(rb'unique constraint violated', re.IGNORECASE)
 
+# Un literal SQL seguido de ',' o del final de la lista de valores
+SQL_LITERAL_RE = re.compile(
+    r"\s*(?:'(?P<string>[^']*(?:''[^']*)*)'|(?P<null>NULL)|"
+    r"(?P<number>[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?))\s*(?P<sep>,|\Z)",
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=1)
 def load_config():
-    """Carga la configuración desde hana_config.conf o variables de entorno"""
-    import os
-    config = {}
-    
+    """Carga la configuración desde hana_config.conf o variables de entorno (una vez por proceso)"""
     # Intentar cargar desde archivo de configuración en schema_to_cap
-    script_dir = Path(__file__).parent
-    config_file = script_dir / "hana_config.conf"
+    config_file = SCRIPT_DIR / "hana_config.conf"
+    required_keys = ['HANA_HOST', 'HANA_PORT', 'HANA_DATABASE', 'HANA_USER', 'HANA_PASSWORD']
     
     if config_file.exists():
         print(f"{Colors.BLUE}Usando configuración desde hana_config.conf{Colors.NC}")
+        config = load_config_file(SCRIPT_DIR)
+        for key in required_keys:
+            if key not in config:
+                print(f"{Colors.RED}Error: Falta la configuración {key} en {config_file}{Colors.NC}")
+                sys.exit(1)
     else:
         # Intentar desde variables de entorno
         print(f"{Colors.BLUE}Intentando cargar desde variables de entorno...{Colors.NC}")
-        env_vars = ['HANA_HOST', 'HANA_PORT', 'HANA_DATABASE', 'HANA_USER', 'HANA_PASSWORD']
-        for var in env_vars:
+        config = {}
+        for var in required_keys:
             value = os.environ.get(var)
             if value:
                 config[var] = value
         
-        if len(config) == len(env_vars):
-            return config
-        else:
+        if len(config) != len(required_keys):
             print(f"{Colors.RED}Error: No se encontró el archivo hana_config.conf ni variables de entorno{Colors.NC}")
             print("Por favor, crea el archivo de configuración primero.")
             sys.exit(1)
     
-    with open(config_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key.strip()] = value.strip().strip('"').strip("'")
-    
-    required_keys = ['HANA_HOST', 'HANA_PORT', 'HANA_DATABASE', 'HANA_USER', 'HANA_PASSWORD']
-    for key in required_keys:
-        if key not in config:
-            print(f"{Colors.RED}Error: Falta la configuración {key} en {config_file}{Colors.NC}")
-            sys.exit(1)
-    
     # Agregar configuraciones opcionales con valores por defecto
     if 'SQL_TIMEOUT' not in config:
-        config['SQL_TIMEOUT'] = os.environ.get('SQL_TIMEOUT', None)  # None = sin timeout
+        config['SQL_TIMEOUT'] = os.environ.get('SQL_TIMEOUT', None)  # None = límite según el archivo
+    
+    # Conteo de registros antes/después de cada archivo (opcional, desactivado por defecto)
+    if 'ENABLE_ROW_STATS' not in config:
+        config['ENABLE_ROW_STATS'] = os.environ.get('ENABLE_ROW_STATS', None)
+    
+    # Mover a created/ todos los archivos exitosos al ejecutar el directorio completo (opcional)
+    if 'MOVE_ALL_ON_SUCCESS' not in config:
+        config['MOVE_ALL_ON_SUCCESS'] = os.environ.get('MOVE_ALL_ON_SUCCESS', None)
+    
+    # Con hdbcli, confirmar cada N filas en lugar de una vez por archivo (opcional)
+    if 'SQL_COMMIT_EVERY' not in config:
+        config['SQL_COMMIT_EVERY'] = os.environ.get('SQL_COMMIT_EVERY', None)
+    
+    # Filas por INSERT agrupado al ejecutar con hdbsql (opcional, por defecto sin agrupar)
+    if 'HDBSQL_BATCH_SIZE' not in config:
+        config['HDBSQL_BATCH_SIZE'] = os.environ.get('HDBSQL_BATCH_SIZE', None)
+    
+    # Archivos ejecutados en paralelo (opcional, por defecto secuencial)
+    if 'SQL_WORKERS' not in config:
+        config['SQL_WORKERS'] = os.environ.get('SQL_WORKERS', None)
+    
+    # Omitir los archivos ya ejecutados correctamente en una ejecución anterior (opcional)
+    if 'SKIP_PROCESSED' not in config:
+        config['SKIP_PROCESSED'] = os.environ.get('SKIP_PROCESSED', None)
     
     # Path al cliente HANA (opcional, se busca automáticamente si no se especifica)
     if 'HANA_CLIENT_PATH' not in config:
@@ -73,96 +178,83 @@ def load_config():
     return config
 
 
-def connect_to_hana(config):
-    """Establece conexión con SAP HANA usando hdbsql o hdbcli"""
-    # Verificar si hdbsql está disponible
-    import shutil
-    hdbsql_path = shutil.which('hdbsql')
+@functools.lru_cache(maxsize=None)
+def derive_schema(user):
+    """
+    Obtiene el schema a partir del usuario de HANA.
+    El formato es: SCHEMA_XXXXX_RT, necesitamos solo SCHEMA
+    """
+    if '_' not in user:
+        return None
+    # Dividir por _ y tomar todo excepto los últimos 2 segmentos
+    parts = user.split('_')
+    if len(parts) >= 3:
+        # Formato: SCHEMA_XXXXX_RT -> tomar SCHEMA
+        return '_'.join(parts[:-2])
+    # Formato: SCHEMA_XXXXX -> tomar SCHEMA
+    return parts[0]
+
+
+def build_conn_params(config, validate_ssl=True):
+    """Construye los parámetros de dbapi.connect a partir de la configuración"""
+    port = int(config['HANA_PORT'])
     
-    if hdbsql_path:
-        # Usar hdbsql si está disponible (más confiable para HANA Cloud)
-        return None  # Retornar None indica que usaremos hdbsql directamente
+    if port != 443:
+        # Para conexiones normales (puerto 30015)
+        return {
+            'address': config['HANA_HOST'],
+            'port': port,
+            'databaseName': config.get('HANA_DATABASE', ''),
+            'user': config['HANA_USER'],
+            'password': config['HANA_PASSWORD']
+        }
     
-    # Si no hay hdbsql, usar hdbcli
+    # Para SAP HANA Cloud con puerto 443, usar SSL
+    conn_params = {
+        'address': config['HANA_HOST'],
+        'port': port,
+        'user': config['HANA_USER'],
+        'password': config['HANA_PASSWORD'],
+        'encrypt': True,
+        'sslValidateCertificate': validate_ssl,
+        'sslHostNameInCertificate': config['HANA_HOST']
+    }
+    
+    # Agregar databaseName solo si está especificado y no es vacío
+    if config.get('HANA_DATABASE'):
+        conn_params['databaseName'] = config['HANA_DATABASE']
+    
+    return conn_params
+
+
+def connect_to_hana(config):
+    """Establece una conexión persistente con SAP HANA usando hdbcli"""
     try:
-        port = int(config['HANA_PORT'])
-        
-        # Para SAP HANA Cloud con puerto 443, usar SSL con validación
-        if port == 443:
-            # Extraer schema del usuario si está disponible (formato: SCHEMA_USER)
-            user = config['HANA_USER']
-            schema = None
-            if '_' in user:
-                # El schema es la parte antes del último guión bajo
-                parts = user.rsplit('_', 1)
-                if len(parts) == 2:
-                    schema = parts[0]
-            
+        if int(config['HANA_PORT']) != 443:
+            conn = dbapi.connect(**build_conn_params(config))
+        else:
             # Intentar con validación de certificado primero (recomendado para producción)
+            # y, si falla, sin validación (solo para desarrollo)
+            for validate_ssl in (True, False):
+                try:
+                    conn = dbapi.connect(**build_conn_params(config, validate_ssl))
+                    break
+                except Exception:
+                    if not validate_ssl:
+                        raise
+                    print(f"{Colors.YELLOW}Advertencia: Falló con validación SSL, intentando sin validación...{Colors.NC}")
+        
+        # Si tenemos schema, establecerlo en la sesión: las tablas DB_* se resuelven contra él
+        schema = config.get('_SCHEMA')
+        if schema:
             try:
-                conn_params = {
-                    'address': config['HANA_HOST'],
-                    'port': port,
-                    'user': user,
-                    'password': config['HANA_PASSWORD'],
-                    'encrypt': True,
-                    'sslValidateCertificate': True,
-                    'sslHostNameInCertificate': config['HANA_HOST']
-                }
-                
-                # Agregar databaseName solo si está especificado y no es vacío
-                if 'HANA_DATABASE' in config and config['HANA_DATABASE']:
-                    conn_params['databaseName'] = config['HANA_DATABASE']
-                
-                conn = dbapi.connect(**conn_params)
-                
-                # Si tenemos schema, establecerlo después de conectar
-                if schema:
-                    try:
-                        cursor = conn.cursor()
-                        cursor.execute(f'SET SCHEMA "{schema}"')
-                        cursor.close()
-                    except:
-                        pass  # Si falla, continuar sin schema
-                
-                return conn
-            except Exception as ssl_error:
-                # Si falla con validación, intentar sin validación (solo para desarrollo)
-                print(f"{Colors.YELLOW}Advertencia: Falló con validación SSL, intentando sin validación...{Colors.NC}")
-                conn_params = {
-                    'address': config['HANA_HOST'],
-                    'port': port,
-                    'user': user,
-                    'password': config['HANA_PASSWORD'],
-                    'encrypt': True,
-                    'sslValidateCertificate': False,
-                    'sslHostNameInCertificate': config['HANA_HOST']
-                }
-                
-                if 'HANA_DATABASE' in config and config['HANA_DATABASE']:
-                    conn_params['databaseName'] = config['HANA_DATABASE']
-                
-                conn = dbapi.connect(**conn_params)
-                
-                if schema:
-                    try:
-                        cursor = conn.cursor()
-                        cursor.execute(f'SET SCHEMA "{schema}"')
-                        cursor.close()
-                    except:
-                        pass
-                
-                return conn
-        else:
-            # Para conexiones normales (puerto 30015)
-            conn = dbapi.connect(
-                address=config['HANA_HOST'],
-                port=port,
-                databaseName=config.get('HANA_DATABASE', ''),
-                user=config['HANA_USER'],
-                password=config['HANA_PASSWORD']
-            )
-            return conn
+                cursor = conn.cursor()
+                cursor.execute(f'SET SCHEMA "{schema}"')
+                cursor.close()
+            except:
+                pass  # Si falla, continuar sin schema
+        
+        return conn
     except Exception as e:
         error_msg = str(e)
         print(f"{Colors.RED}Error al conectar con SAP HANA: {error_msg}{Colors.NC}")
@@ -181,77 +273,180 @@ def connect_to_hana(config):
 
 
 def get_table_name_from_sql(content, schema):
-    """Extrae el nombre de la tabla del primer INSERT statement"""
-    import re
-    # Buscar INSERT INTO con posibles esquemas y nombres de tabla entre comillas
-    # Patrones: INSERT INTO "SCHEMA"."TABLE" o INSERT INTO TABLE o INSERT INTO DB_TABLE
-    patterns = [
-        r'INSERT\s+INTO\s+"([^"]+)"\s*\.\s*"([^"]+)"',  # "schema"."table"
-        r'INSERT\s+INTO\s+(\w+)\s*\.\s*(\w+)',  # schema.table
-        r'INSERT\s+INTO\s+"?(\w+)"?',  # table o "table"
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            if len(match.groups()) == 2:
-                # Tiene schema y tabla
-                table_schema = match.group(1)
-                table_name = match.group(2)
-                return table_schema, table_name
-            elif len(match.groups()) == 1:
-                # Solo tabla (sin schema explícito)
-                table_name = match.group(1)
-                # Verificar si es DB_* (necesita schema)
-                if table_name.upper().startswith('DB_'):
-                    return schema, table_name
-                return None, table_name
-    
+    """Extrae el nombre de la tabla del primer INSERT statement (content en bytes o mmap)"""
+    # Patrones: INSERT INTO "SCHEMA"."TABLE", INSERT INTO SCHEMA.TABLE o INSERT INTO DB_TABLE
+    match = INSERT_TARGET_RE.search(content)
+    if not match:
+        return None, None
+    quoted_schema, quoted_table, plain_schema, plain_table, table = match.groups()
+    if quoted_table:
+        # Tiene schema y tabla
+        return quoted_schema.decode('utf-8', errors='ignore'), quoted_table.decode('utf-8', errors='ignore')
+    if plain_table:
+        return plain_schema.decode('utf-8', errors='ignore'), plain_table.decode('utf-8', errors='ignore')
+    if table:
+        # Solo tabla (sin schema explícito)
+        table_name = table.decode('utf-8', errors='ignore')
+        # Verificar si es DB_* (necesita schema)
+        if table_name.upper().startswith('DB_'):
+            return schema, table_name
+        return None, table_name
     return None, None
 
 
-def count_table_records(hdbsql_path, config, schema, table_name):
-    """Cuenta los registros en una tabla usando hdbsql"""
-    if not table_name:
-        return None
-    try:
-        import subprocess
+class HdbsqlSession:
+    """
+    Sesión hdbsql persistente para consultar COUNT(*) varias veces sobre la misma
+    conexión (un solo proceso, handshake TLS y autenticación por archivo)
+    """
+    
+    def __init__(self, hdbsql_path, config):
         host_port = f"{config['HANA_HOST']}:{config['HANA_PORT']}"
-        query = f'SELECT COUNT(*) FROM "{schema}"."{table_name}";'
         cmd = [
             hdbsql_path,
             '-n', host_port,
             '-u', config['HANA_USER'],
             '-p', config['HANA_PASSWORD'],
             '-attemptencrypt',
-            '-quiet'
+            '-quiet',
+            '-a',  # sin nombres de columna
+            '-x',  # sin mensajes adicionales ("1 row selected")
+            '-j'   # sin paginación
         ]
-        # Timeout para queries de conteo (más corto)
-        result = subprocess.run(cmd, input=query, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0 and result.stdout:
-            # Parsear el resultado: "COUNT(*)\n12345\n1 row selected"
-            lines = [l.strip() for l in result.stdout.strip().split('\n') if l.strip() and not l.strip().startswith('COUNT')]
-            if lines:
-                try:
-                    return int(lines[0])
-                except:
-                    pass
-    except:
-        pass
-    return None
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        # El thread de progreso y el principal comparten la sesión
+        self.lock = threading.Lock()
+        # La salida se lee en un thread aparte para poder esperarla con un tiempo límite
+        # (None marca el fin de la salida)
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read_output, daemon=True).start()
+    
+    def _read_output(self):
+        """Pasa cada línea de la salida de hdbsql a la cola"""
+        try:
+            for line in self.proc.stdout:
+                self.lines.put(line)
+        except (OSError, ValueError):
+            pass
+        self.lines.put(None)
+    
+    def count_records(self, schema, table_name):
+        """Cuenta los registros en una tabla; retorna None si no se pudo obtener"""
+        if not table_name:
+            return None
+        with self.lock:
+            if self.proc.poll() is not None:
+                # hdbsql terminó (error de conexión o autenticación, o tiempo límite vencido)
+                return None
+            try:
+                # Cada consulta se cierra con un SELECT de la marca para saber dónde termina
+                self.proc.stdin.write(f'SELECT COUNT(*) FROM "{schema}"."{table_name}";\n')
+                self.proc.stdin.write(f"SELECT '{HDBSQL_SESSION_MARKER}' FROM DUMMY;\n")
+                self.proc.stdin.flush()
+                deadline = time.monotonic() + HDBSQL_SESSION_TIMEOUT
+                count = None
+                while True:
+                    line = self.lines.get(timeout=max(0, deadline - time.monotonic()))
+                    if line is None:
+                        return None
+                    value = line.strip().strip('"')
+                    if value == HDBSQL_SESSION_MARKER:
+                        return count
+                    if value.isdigit():
+                        count = int(value)
+            except OSError:
+                return None
+            except queue.Empty:
+                # hdbsql no respondió a tiempo: se termina la sesión para no quedar bloqueados
+                self.proc.kill()
+                return None
+    
+    def close(self):
+        """Cierra la sesión hdbsql"""
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+
+
+@contextmanager
+def map_file(file_path):
+    """Mapea un archivo en memoria en solo lectura; un archivo vacío se entrega como b''"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def config_flag(config, key):
+    """Indica si una opción booleana de la configuración está activa (true/1/yes/si)"""
+    return bool(config) and str(config.get(key) or '').lower() in ('1', 'true', 'yes', 'si', 'sí')
+
+
+def count_table_records_hdbcli(cursor, schema, table_name):
+    """Cuenta los registros en una tabla usando el cursor de la conexión persistente"""
+    if not table_name:
+        return None
+    try:
+        cursor.execute(f'SELECT COUNT(*) FROM "{schema}"."{table_name}"')
+        return cursor.fetchone()[0]
+    except dbapi.Error:
+        return None
 
 
 def count_insert_statements(content):
-    """Cuenta cuántos INSERT statements hay en el contenido"""
-    import re
-    # Contar líneas que contienen INSERT INTO (no comentarios)
-    lines = content.split('\n')
-    count = 0
-    for line in lines:
-        stripped = line.strip()
-        if stripped and not stripped.startswith('--') and re.search(r'INSERT\s+INTO', stripped, re.IGNORECASE):
-            count += 1
-    return count
+    """Cuenta cuántos INSERT statements hay en el contenido (bytes o mmap)"""
+    # Contar líneas que contienen INSERT INTO (no comentarios) en una sola pasada del regex
+    return len(INSERT_COUNT_BYTES_RE.findall(content))
+
+
+def scan_and_batch_sql(sql_file_path, dst_file, schema, batch_size):
+    """
+    Copia un archivo SQL a dst_file agrupando los INSERT consecutivos con la misma tabla y
+    columnas en un solo INSERT ... SELECT ... FROM DUMMY UNION ALL ... de hasta batch_size
+    filas (HANA no admite VALUES con varias filas). Retorna (total_inserts, table_schema, table_name).
+    """
+    total_inserts = 0
+    table_schema, table_name = None, None
+    batch_target = None
+    batch_values = []
+    
+    def write_batch():
+        if batch_values:
+            selects = ' FROM DUMMY UNION ALL\nSELECT '.join(batch_values)
+            dst_file.write(f'{batch_target} SELECT {selects} FROM DUMMY;\n'.encode('utf-8'))
+            batch_values.clear()
+    
+    for statement in iter_sql_statements(sql_file_path):
+        match = INSERT_VALUES_RE.fullmatch(statement)
+        if match is None:
+            # Cualquier otro statement se escribe tal cual, respetando el orden
+            write_batch()
+            batch_target = None
+            dst_file.write(f'{statement};\n'.encode('utf-8'))
+            continue
+        total_inserts += 1
+        if table_name is None:
+            table_schema, table_name = get_table_name_from_sql(statement.encode('utf-8'), schema)
+        columns = match.group('columns')
+        target = f"INSERT INTO {match.group('table')} {columns}" if columns else f"INSERT INTO {match.group('table')}"
+        if target != batch_target or len(batch_values) >= batch_size:
+            write_batch()
+            batch_target = target
+        batch_values.append(match.group('values'))
+    write_batch()
+    return total_inserts, table_schema, table_name
+
+
+def count_unique_violations(log_path):
+    """Cuenta los errores de constraint única en un log sin cargarlo en memoria"""
+    with map_file(log_path) as content:
+        return len(UNIQUE_VIOLATION_RE.findall(content))
 
 
 def show_progress(current_count, initial_count, total_inserts):
@@ -264,22 +459,51 @@ def show_progress(current_count, initial_count, total_inserts):
     return f"  Progreso: {inserted:,}/{total_inserts:,} insertados ({percent:.1f}%)"
 
 
-def monitor_progress(hdbsql_path, config, schema, table_name, initial_count, total_inserts, stop_event):
-    """Monitorea el progreso de inserción en un thread separado"""
+class ProgressPrinter:
+    """Línea de progreso reescrita en el lugar (\r) que se cierra con un único salto de línea"""
+    
+    def __init__(self):
+        self.active = False
+    
+    def update(self, text):
+        """Reemplaza la línea de progreso actual"""
+        sys.stdout.write(f"\r{text}")
+        sys.stdout.flush()
+        self.active = True
+    
+    def close(self):
+        """Termina la línea de progreso, solo si se llegó a mostrar"""
+        if self.active:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+            self.active = False
+
+
+def monitor_progress(printer, session, schema, table_name, initial_count, total_inserts, stop_event):
+    """
+    Monitorea el progreso de inserción en un thread separado sobre una sesión hdbsql persistente.
+    El conteo final lo hace execute_sql_file al terminar hdbsql (una sola consulta más).
+    """
     last_count = initial_count
-    update_interval = 0.5  # Actualizar cada medio segundo
+    update_interval = PROGRESS_MIN_INTERVAL
     
     while not stop_event.is_set():
         try:
-            current_count = count_table_records(hdbsql_path, config, schema, table_name)
-            if current_count is not None:
-                # Actualizar siempre que cambie el conteo
-                if current_count != last_count:
-                    progress = show_progress(current_count, initial_count, total_inserts)
-                    # Actualizar la línea de progreso en la parte inferior
-                    sys.stdout.write(f"\r{progress}")
-                    sys.stdout.flush()
-                    last_count = current_count
+            start = time.monotonic()
+            current_count = session.count_records(schema, table_name)
+            # Nunca consultar más seguido que unas veces lo que tarda el propio COUNT(*)
+            latency_interval = min(max((time.monotonic() - start) * 4, PROGRESS_MIN_INTERVAL), PROGRESS_MAX_INTERVAL)
+            if current_count is not None and current_count != last_count:
+                # Actualizar la línea de progreso en la parte inferior
+                printer.update(show_progress(current_count, initial_count, total_inserts))
+                last_count = current_count
+                update_interval = latency_interval
+            else:
+                # Sin cambios: espaciar las consultas al doble cada vez
+                update_interval = min(max(update_interval * 2, latency_interval), PROGRESS_IDLE_MAX_INTERVAL)
+            # Cerca del final se vuelve al intervalo mínimo para que el progreso responda
+            if total_inserts > 0 and (last_count - initial_count) / total_inserts > 0.95:
+                update_interval = PROGRESS_MIN_INTERVAL
             # Esperar antes de la siguiente verificación
             if stop_event.wait(timeout=update_interval):
                 break
@@ -287,22 +511,6 @@ def monitor_progress(hdbsql_path, config, schema, table_name, initial_count, tot
             # Si hay error al contar, continuar intentando
             if stop_event.wait(timeout=1):
                 break
-    
-    # Mostrar progreso final (última actualización)
-    try:
-        final_count = count_table_records(hdbsql_path, config, schema, table_name)
-        if final_count is not None:
-            progress = show_progress(final_count, initial_count, total_inserts)
-            sys.stdout.write(f"\r{progress}\n")
-            sys.stdout.flush()
-        else:
-            # Si no se puede obtener el conteo final, al menos limpiar la línea
-            sys.stdout.write("\n")
-            sys.stdout.flush()
-    except Exception:
-        # Si hay error, limpiar la línea
-        sys.stdout.write("\n")
-        sys.stdout.flush()
 
 
 def find_hdbsql_path(config=None):
@@ -312,13 +520,9 @@ def find_hdbsql_path(config=None):
     2. Si no está en PATH, usa HANA_CLIENT_PATH del config (obligatorio)
     3. Si tampoco está configurado, retorna None
     """
-    import os
-    import shutil
-    
     # 1. Intentar encontrar en PATH del sistema
-    hdbsql_path = shutil.which('hdbsql')
-    if hdbsql_path:
-        return hdbsql_path
+    if HDBSQL_ON_PATH:
+        return HDBSQL_ON_PATH
     
     # 2. Si no está en PATH, usar HANA_CLIENT_PATH del config (obligatorio)
     if config and config.get('HANA_CLIENT_PATH'):
@@ -345,73 +549,357 @@ def find_hdbsql_path(config=None):
     return None
 
 
-def execute_sql_file(conn, sql_file_path, log_dir, config=None):
-    """Ejecuta un archivo SQL y retorna el resultado"""
-    import subprocess
-    import tempfile
-    import os
+def split_sql_statements(buffer):
+    """
+    Divide un bloque de bytes SQL en statements completos (sin comentarios).
+    Retorna (statements, resto) donde resto es lo que sigue al último ';'.
+    """
+    statements = []
+    parts = []
+    start = 0
+    cut = 0
+    for token in SQL_STATEMENT_TOKEN_RE.finditer(buffer):
+        text = token.group()
+        if text.startswith(b'--'):
+            # Descartar el comentario
+            parts.append(buffer[start:token.start()])
+            start = token.end()
+        elif text == b';':
+            parts.append(buffer[start:token.start()])
+            statement = b''.join(parts).strip()
+            if statement:
+                statements.append(statement)
+            parts = []
+            start = cut = token.end()
+    return statements, buffer[cut:]
+
+
+def iter_sql_statements(sql_file_path):
+    """Lee un archivo SQL por bloques y genera sus statements uno a uno sin cargarlo entero"""
+    pending = b''
+    with open(sql_file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(SQL_READ_CHUNK_SIZE), b''):
+            # Lo que sigue al último ';' se vuelve a analizar con el siguiente bloque
+            statements, pending = split_sql_statements(pending + chunk)
+            for statement in statements:
+                yield statement.decode('utf-8', errors='ignore')
+    # El último statement puede no terminar en ';'
+    statements, _ = split_sql_statements(pending + b';')
+    for statement in statements:
+        yield statement.decode('utf-8', errors='ignore')
+
+
+def count_insert_statements_in_file(sql_file_path):
+    """Cuenta los INSERT statements de un archivo sin cargarlo en memoria"""
+    with map_file(sql_file_path) as content:
+        return count_insert_statements(content)
+
+
+def parse_sql_values(values_text):
+    """Convierte la lista de literales de un VALUES (...) en una tupla de Python.
+    Retorna None si contiene algo distinto de strings, números o NULL."""
+    values = []
+    pos = 0
+    end = len(values_text)
+    while pos < end:
+        match = SQL_LITERAL_RE.match(values_text, pos)
+        if not match:
+            return None
+        if match.group('string') is not None:
+            values.append(match.group('string').replace("''", "'"))
+        elif match.group('null') is not None:
+            values.append(None)
+        else:
+            number = match.group('number')
+            if '.' in number or 'e' in number or 'E' in number:
+                # Decimal conserva el literal exacto (float perdería precisión en DECIMAL)
+                values.append(decimal.Decimal(number))
+            else:
+                values.append(int(number))
+        pos = match.end()
+        if match.group('sep') == ',' and pos >= end:
+            # Coma final sin valor
+            return None
+    return tuple(values) if values else None
+
+
+def parse_insert_statement(statement):
+    """Convierte un INSERT con literales en (sql parametrizado, tupla de valores).
+    Retorna None si el statement no puede ejecutarse como INSERT parametrizado."""
+    match = INSERT_VALUES_RE.fullmatch(statement)
+    if not match:
+        return None
+    values = parse_sql_values(match.group('values'))
+    if values is None:
+        return None
+    table = match.group('table')
+    columns = match.group('columns') or ''
+    if columns:
+        columns = f' {columns}'
+    placeholders = ', '.join('?' * len(values))
+    return f'INSERT INTO {table}{columns} VALUES ({placeholders})', values
+
+
+def group_insert_batches(statements):
+    """Agrupa INSERTs consecutivos con el mismo destino en lotes de hasta INSERT_BATCH_SIZE.
+    Genera tuplas (sql, filas); filas es None para statements que se ejecutan tal cual."""
+    batch_sql = None
+    batch_rows = []
+    for statement in statements:
+        parsed = parse_insert_statement(statement)
+        if parsed is None:
+            if batch_rows:
+                yield batch_sql, batch_rows
+                batch_sql, batch_rows = None, []
+            yield statement, None
+            continue
+        sql, values = parsed
+        if sql != batch_sql or len(batch_rows) >= INSERT_BATCH_SIZE:
+            if batch_rows:
+                yield batch_sql, batch_rows
+            batch_sql, batch_rows = sql, []
+        batch_rows.append(values)
+    if batch_rows:
+        yield batch_sql, batch_rows
+
+
+def execute_sql_file_hdbcli(conn, sql_file_path, error_log_path, output_log_path, schema=None, row_stats=False,
+                            records_cache=None, commit_every=None):
+    """
+    Ejecuta un archivo SQL sobre la conexión hdbcli persistente usando executemany por lotes.
+    Hace un solo commit al final del archivo, o cada commit_every filas si se indica.
+    """
+    # Se crea antes de cualquier operación que pueda fallar: el manejo de errores la cierra
+    printer = ProgressPrinter()
+    cursor = None
+    records_before = None
+    # INSERT parametrizado preparado actualmente en el cursor
+    prepared_sql = None
+    # Filas enviadas desde el último commit (para SQL_COMMIT_EVERY)
+    uncommitted = 0
+    total = 0
+    executed = 0
+    inserted = 0
+    duplicates = 0
+    errors = []
+    
+    try:
+        if os.path.getsize(sql_file_path) == 0:
+            return {'success': False, 'error': 'Archivo vacío', 'skipped': True}
+        
+        cursor = conn.cursor()
+        
+        # Con ENABLE_ROW_STATS se cuentan los registros en la misma conexión
+        if row_stats:
+            with map_file(sql_file_path) as content:
+                table_schema, table_name = get_table_name_from_sql(content, schema)
+            # El conteo final del archivo anterior sobre la misma tabla evita un COUNT(*)
+            records_before = records_cache.get((table_schema or schema, table_name)) if records_cache else None
+            if records_before is None:
+                records_before = count_table_records_hdbcli(cursor, table_schema or schema, table_name)
+            if records_before is not None:
+                print(f"  {Colors.BLUE}Registros antes: {records_before:,}{Colors.NC}")
+        
+        # El progreso se calcula en el cliente con las filas enviadas, sin consultar COUNT(*)
+        total_inserts = count_insert_statements_in_file(sql_file_path)
+        if total_inserts > 0:
+            print(f"  {Colors.BLUE}INSERT statements a ejecutar: {total_inserts:,}{Colors.NC}")
+        print(f"  {Colors.BLUE}Ejecutando INSERT statements...{Colors.NC}")
+        printer.update(show_progress(0, 0, total_inserts))
+        
+        # Las tablas DB_* sin schema las resuelve HANA con el schema de la sesión
+        # (SET SCHEMA al abrir la conexión)
+        for sql, rows in group_insert_batches(iter_sql_statements(sql_file_path)):
+            if rows is None:
+                total += 1
+                # execute reemplaza el statement preparado del cursor
+                prepared_sql = None
+                try:
+                    cursor.execute(sql)
+                    executed += 1
+                except dbapi.Error as e:
+                    errors.append(f"Error: {e}\nStatement: {sql[:200]}...")
+                continue
+            
+            total += len(rows)
+            batch_error = None
+            try:
+                # Se prepara una sola vez por destino y se reutiliza en los lotes siguientes
+                if sql != prepared_sql:
+                    prepared_sql = None
+                    cursor.prepare(sql)
+                    prepared_sql = sql
+                cursor.executemanyprepared(rows)
+            except dbapi.Error as e:
+                batch_error = e
+            
+            # Actualizar la línea de progreso al terminar cada lote
+            printer.update(show_progress(total, 0, total_inserts))
+            
+            # En archivos muy grandes se puede confirmar cada cierta cantidad de filas
+            uncommitted += len(rows)
+            if commit_every and uncommitted >= commit_every:
+                conn.commit()
+                uncommitted = 0
+            
+            if batch_error is None:
+                executed += len(rows)
+                inserted += len(rows)
+                continue
+            
+            # hdbcli continúa el lote y reporta las filas fallidas en e.errors
+            failed = getattr(batch_error, 'errors', None)
+            if not failed:
+                errors.append(f"Error en lote de {len(rows)} filas: {batch_error}\nStatement: {sql[:200]}...")
+                continue
+            
+            for error in failed:
+                if 'unique constraint violated' in error.errortext.lower():
+                    duplicates += 1
+                else:
+                    errors.append(f"Error: {error.errortext}\nStatement: {sql[:200]}...\nFila: {rows[error.rownumber]}")
+            
+            executed += len(rows) - len(failed)
+            inserted += len(rows) - len(failed)
+        
+        # Un solo commit por archivo (o el de las filas restantes con SQL_COMMIT_EVERY)
+        conn.commit()
+        
+        records_after = None
+        if records_before is not None:
+            records_after = count_table_records_hdbcli(cursor, table_schema or schema, table_name)
+            if records_after is not None and records_cache is not None:
+                records_cache[(table_schema or schema, table_name)] = records_after
+    except Exception as e:
+        # Cualquier falla (de HANA, de lectura del archivo o de los parámetros del lote)
+        # se reporta como error del archivo, igual que en la ejecución con hdbsql
+        printer.close()
+        # Descartar lo pendiente: si no, el commit del siguiente archivo en la misma
+        # conexión confirmaría este archivo a medias
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        with open(error_log_path, 'w', encoding='utf-8') as err_file:
+            err_file.write(f"Error fatal: {str(e)}\n")
+        return {'success': False, 'error': str(e)}
+    finally:
+        if cursor is not None:
+            cursor.close()
+    
+    printer.close()
     
+    if total == 0:
+        return {'success': False, 'error': 'No se encontraron statements SQL válidos', 'skipped': True}
+    
+    with open(output_log_path, 'w', encoding='utf-8') as out_file:
+        out_file.write(f"Statements en archivo: {total:,}\n")
+        out_file.write(f"Statements ejecutados: {executed:,}\n")
+        out_file.write(f"Registros insertados: {inserted:,}\n")
+        if records_before is not None and records_after is not None:
+            out_file.write(f"\n--- Estadísticas de inserción ---\n")
+            out_file.write(f"Registros antes: {records_before:,}\n")
+            out_file.write(f"Registros después: {records_after:,}\n")
+    
+    if errors or duplicates:
+        with open(error_log_path, 'w', encoding='utf-8') as err_file:
+            if duplicates:
+                err_file.write(f"Advertencia: {duplicates} registros ya existían (unique constraint)\n")
+            if errors:
+                err_file.write('\n\n'.join(errors))
+                err_file.write('\n')
+    
+    if errors:
+        return {
+            'success': False,
+            'error': f'{len(errors)} errores de {total} statements',
+            'executed': executed,
+            'total': total
+        }
+    
+    if records_after is not None:
+        print(f"  {Colors.BLUE}Registros después: {records_after:,}{Colors.NC}")
+    print(f"  {Colors.GREEN}✓ Registros insertados: {inserted:,}{Colors.NC}")
+    result_dict = {
+        'success': True,
+        'executed': executed,
+        'total': total,
+        'records_inserted': inserted
+    }
+    if records_before is not None and records_after is not None:
+        result_dict['records_before'] = records_before
+        result_dict['records_after'] = records_after
+    if duplicates:
+        result_dict['warning'] = f'{duplicates} registros duplicados fueron omitidos'
+    return result_dict
+
+
+def execute_sql_file(conn, sql_file_path, log_dir, config=None, records_cache=None):
+    """
+    Ejecuta un archivo SQL y retorna el resultado.
+    records_cache guarda el último conteo de cada tabla ((schema, tabla) -> registros)
+    para usarlo como conteo inicial del siguiente archivo sobre la misma tabla.
+    """
     filename = os.path.basename(sql_file_path)
     error_log_path = log_dir / f"{filename}.err"
     output_log_path = log_dir / f"{filename}.out"
     
-    # Encontrar hdbsql
-    hdbsql_path = find_hdbsql_path(config)
+    # Schema derivado del usuario una sola vez en main (ver derive_schema)
+    schema = config.get('_SCHEMA') if config else None
+    
+    # Con conexión hdbcli persistente se ejecuta en la misma sesión por lotes
+    if conn is not None:
+        try:
+            commit_every = int(config.get('SQL_COMMIT_EVERY') or 0)
+        except ValueError:
+            commit_every = 0
+        return execute_sql_file_hdbcli(conn, sql_file_path, error_log_path, output_log_path,
+                                       schema, config_flag(config, 'ENABLE_ROW_STATS'), records_cache,
+                                       commit_every)
+    
+    # Encontrar hdbsql (main ya lo resuelve una vez por ejecución)
+    hdbsql_path = (config.get('_HDBSQL_PATH') or find_hdbsql_path(config)) if config else None
     
     if hdbsql_path and config:
         # Usar hdbsql (más confiable para HANA Cloud)
         # Lógica idéntica al script temporal que funciona
+        session = None
+        temp_sql_path = None
+        stop_event = threading.Event()
+        progress_thread = None
+        printer = ProgressPrinter()
         try:
-            import re
-            
-            # Extraer schema del usuario
-            # El formato es: SCHEMA_XXXXX_RT, necesitamos solo SCHEMA
-            user = config['HANA_USER']
-            schema = None
-            if '_' in user:
-                # Dividir por _ y tomar todo excepto los últimos 2 segmentos
-                parts = user.split('_')
-                if len(parts) >= 3:
-                    # Formato: SCHEMA_XXXXX_RT -> tomar SCHEMA
-                    schema = '_'.join(parts[:-2])
-                elif len(parts) == 2:
-                    # Formato: SCHEMA_XXXXX -> tomar SCHEMA
-                    schema = parts[0]
-                else:
-                    schema = parts[0]
-            
-            # Leer contenido del archivo SQL original
-            with open(sql_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            # Filas por INSERT agrupado (HDBSQL_BATCH_SIZE); sin configurar se copia tal cual
+            try:
+                batch_size = int(config.get('HDBSQL_BATCH_SIZE') or 1)
+            except ValueError:
+                batch_size = 1
             
-            # Contar INSERT statements y obtener nombre de tabla para progreso
-            total_inserts = count_insert_statements(content)
-            table_schema, table_name = get_table_name_from_sql(content, schema)
+            # Las tablas DB_* sin schema las resuelve HANA con el schema de la sesión
+            # (-Z CURRENTSCHEMA), así hdbsql lee el archivo original sin copiarlo.
+            # Solo al agrupar INSERTs se escribe un archivo temporal con el SQL reescrito
+            if batch_size > 1:
+                with tempfile.NamedTemporaryFile(mode='wb', suffix='.sql', delete=False) as temp_sql:
+                    temp_sql_path = temp_sql.name
+                    total_inserts, table_schema, table_name = scan_and_batch_sql(sql_file_path, temp_sql, schema, batch_size)
+            else:
+                with map_file(sql_file_path) as content:
+                    total_inserts = count_insert_statements(content)
+                    table_schema, table_name = get_table_name_from_sql(content, schema)
+            sql_file_to_use = temp_sql_path or str(sql_file_path)
             
-            # Contar registros antes de insertar
+            # Contar registros antes de insertar (COUNT(*) sobre la tabla, solo con ENABLE_ROW_STATS).
+            # Los conteos antes/durante/después van por una misma sesión hdbsql abierta
             records_before = None
-            if table_name and hdbsql_path:
-                records_before = count_table_records(hdbsql_path, config, schema, table_name)
+            if config_flag(config, 'ENABLE_ROW_STATS') and table_name and hdbsql_path:
+                session = HdbsqlSession(hdbsql_path, config)
+                records_before = records_cache.get((schema, table_name)) if records_cache else None
+                if records_before is None:
+                    records_before = session.count_records(schema, table_name)
                 if records_before is not None:
                     print(f"  {Colors.BLUE}Registros antes: {records_before:,}{Colors.NC}")
-                    if total_inserts > 0:
-                        print(f"  {Colors.BLUE}INSERT statements a ejecutar: {total_inserts:,}{Colors.NC}")
-            
-            # Si tenemos schema, reemplazar referencias a tablas DB_* con schema completo
-            if schema:
-                content = re.sub(
-                    r'(INSERT\s+INTO)\s+(DB_\w+)',
-                    rf'\1 "{schema}"."\2"',
-                    content,
-                    flags=re.IGNORECASE
-                )
-            
-            # Crear archivo temporal
-            temp_sql = tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False, encoding='utf-8')
-            temp_sql.write(content)
-            temp_sql.flush()
-            temp_sql.close()
-            sql_file_to_use = temp_sql.name
+            if total_inserts > 0:
+                print(f"  {Colors.BLUE}INSERT statements a ejecutar: {total_inserts:,}{Colors.NC}")
             
             # Construir comando hdbsql
             host_port = f"{config['HANA_HOST']}:{config['HANA_PORT']}"
@@ -424,86 +912,88 @@ def execute_sql_file(conn, sql_file_path, log_dir, config=None):
                 '-I', sql_file_to_use,
                 '-quiet'
             ]
+            if schema:
+                cmd += ['-Z', f'CURRENTSCHEMA={schema}']
             
             # Ejecutar y capturar tanto stdout como stderr
             # Iniciar monitoreo de progreso en thread separado
-            stop_event = threading.Event()
-            progress_thread = None
             if table_name and records_before is not None:
                 print(f"  {Colors.BLUE}Ejecutando INSERT statements...{Colors.NC}")
                 # Mostrar progreso inicial en nueva línea (parte inferior)
-                initial_progress = show_progress(records_before, records_before, total_inserts)
-                sys.stdout.write(initial_progress)
-                sys.stdout.flush()
+                printer.update(show_progress(records_before, records_before, total_inserts))
                 if total_inserts > 0:
                     progress_thread = threading.Thread(
                         target=monitor_progress,
-                        args=(hdbsql_path, config, schema, table_name, records_before, total_inserts, stop_event),
+                        args=(printer, session, schema, table_name, records_before, total_inserts, stop_event),
                         daemon=True
                     )
                     progress_thread.start()
             else:
                 print(f"  {Colors.BLUE}Ejecutando INSERT statements...{Colors.NC}")
+                # La salida va con buffer: mostrarla antes de esperar a hdbsql
+                sys.stdout.flush()
             
-            # Obtener timeout desde configuración o usar None (sin timeout)
-            timeout_seconds = config.get('SQL_TIMEOUT')
-            if timeout_seconds:
-                try:
-                    timeout_seconds = int(timeout_seconds)
-                except:
-                    timeout_seconds = None
-            else:
-                timeout_seconds = None  # Sin timeout por defecto
+            # Obtener timeout desde configuración (0 = sin timeout). Sin configurar se usa un
+            # límite holgado según la cantidad de INSERT, para que un hdbsql colgado no
+            # bloquee toda la ejecución
+            try:
+                timeout_seconds = int(config.get('SQL_TIMEOUT') or 0) or None
+            except ValueError:
+                timeout_seconds = None
+            if config.get('SQL_TIMEOUT') is None:
+                timeout_seconds = max(SQL_TIMEOUT_MIN_SECONDS, int(total_inserts * SQL_TIMEOUT_PER_INSERT))
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_seconds)
+            # stdout y stderr de hdbsql van directo a los logs, sin cargarlos en memoria
+            with open(output_log_path, 'wb') as out_file, open(error_log_path, 'wb') as err_file:
+                proc = subprocess.Popen(cmd, stdout=out_file, stderr=err_file)
+                try:
+                    returncode = proc.wait(timeout=timeout_seconds)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+                    raise
             
             # Detener el monitoreo de progreso
+            stop_event.set()
             if progress_thread:
-                stop_event.set()
                 progress_thread.join(timeout=2)
-                # Limpiar la línea de progreso si el thread no lo hizo
-                sys.stdout.write("\n")
-                sys.stdout.flush()
             
-            # Contar registros después de insertar (siempre, incluso si hubo errores)
+            # Contar registros después de insertar (siempre, incluso si hubo errores). Este
+            # mismo conteo actualiza por última vez la línea de progreso
             records_after = None
             if table_name and hdbsql_path and records_before is not None:
-                records_after = count_table_records(hdbsql_path, config, schema, table_name)
+                records_after = session.count_records(schema, table_name)
                 if records_after is not None:
-                    inserted = records_after - records_before
-                    print(f"  {Colors.BLUE}Registros después: {records_after:,}{Colors.NC}")
-                    if inserted > 0:
-                        print(f"  {Colors.GREEN}✓ Registros insertados: {inserted:,}{Colors.NC}")
-                    elif inserted < 0:
-                        print(f"  {Colors.YELLOW}⚠ Diferencia: {inserted:,} (posibles duplicados eliminados){Colors.NC}")
-                    elif inserted == 0 and total_inserts > 0:
-                        print(f"  {Colors.YELLOW}⚠ No se insertaron nuevos registros (posiblemente ya existían){Colors.NC}")
+                    printer.update(show_progress(records_after, records_before, total_inserts))
+            printer.close()
             
-            # Guardar output
-            with open(output_log_path, 'w', encoding='utf-8') as out_file:
-                if result.stdout:
-                    out_file.write(result.stdout)
-                # Agregar información de conteo
-                if records_before is not None and records_after is not None:
+            if records_after is not None:
+                if records_cache is not None:
+                    records_cache[(schema, table_name)] = records_after
+                inserted = records_after - records_before
+                print(f"  {Colors.BLUE}Registros después: {records_after:,}{Colors.NC}")
+                if inserted > 0:
+                    print(f"  {Colors.GREEN}✓ Registros insertados: {inserted:,}{Colors.NC}")
+                elif inserted < 0:
+                    print(f"  {Colors.YELLOW}⚠ Diferencia: {inserted:,} (posibles duplicados eliminados){Colors.NC}")
+                elif inserted == 0 and total_inserts > 0:
+                    print(f"  {Colors.YELLOW}⚠ No se insertaron nuevos registros (posiblemente ya existían){Colors.NC}")
+            
+            # Agregar información de conteo al output
+            if records_before is not None and records_after is not None:
+                with open(output_log_path, 'a', encoding='utf-8') as out_file:
                     out_file.write(f"\n--- Estadísticas de inserción ---\n")
                     out_file.write(f"Registros antes: {records_before:,}\n")
                     out_file.write(f"Registros después: {records_after:,}\n")
                     out_file.write(f"Registros insertados: {records_after - records_before:,}\n")
                     out_file.write(f"INSERT statements en archivo: {total_inserts:,}\n")
             
-            # Limpiar archivo temporal
-            try:
-                if os.path.exists(sql_file_to_use):
-                    os.unlink(sql_file_to_use)
-            except:
-                pass
-            
             # Verificar si hay errores de constraint única (datos duplicados)
-            stderr_lower = result.stderr.lower() if result.stderr else ''
+            unique_constraint_count = count_unique_violations(error_log_path)
             
-            unique_constraint_count = stderr_lower.count('unique constraint violated')
-            
-            if result.returncode == 0:
+            if returncode == 0:
+                # Sin errores no se deja archivo .err
+                os.unlink(error_log_path)
                 result_dict = {
                     'success': True,
                     'executed': 1,
@@ -516,12 +1006,11 @@ def execute_sql_file(conn, sql_file_path, log_dir, config=None):
                 return result_dict
             elif unique_constraint_count > 0:
                 # Errores de constraint única son aceptables (datos duplicados)
-                with open(error_log_path, 'w', encoding='utf-8') as err_file:
+                # El detalle de hdbsql ya está en el log; se agrega el resumen al final
+                with open(error_log_path, 'a', encoding='utf-8') as err_file:
+                    err_file.write("\n--- Resumen ---\n")
                     err_file.write(f"Advertencia: {unique_constraint_count} registros ya existían (unique constraint)\n")
                     err_file.write("El script se ejecutó correctamente, pero algunos datos eran duplicados.\n")
-                    if result.stderr:
-                        err_file.write("\n--- Detalles de errores ---\n")
-                        err_file.write(result.stderr)
                 return {
                     'success': True,
                     'executed': 1,
@@ -529,106 +1018,134 @@ def execute_sql_file(conn, sql_file_path, log_dir, config=None):
                     'warning': f'{unique_constraint_count} registros duplicados fueron omitidos'
                 }
             else:
-                with open(error_log_path, 'w', encoding='utf-8') as err_file:
-                    if result.stderr:
-                        err_file.write(result.stderr)
-                    if result.stdout:
-                        err_file.write('\n--- STDOUT ---\n')
-                        err_file.write(result.stdout)
+                if os.path.getsize(output_log_path) > 0:
+                    with open(error_log_path, 'ab') as err_file, open(output_log_path, 'rb') as out_file:
+                        err_file.write(b'\n--- STDOUT ---\n')
+                        shutil.copyfileobj(out_file, err_file)
                 return {
                     'success': False,
-                    'error': f'hdbsql error (código: {result.returncode})'
+                    'error': f'hdbsql error (código: {returncode})'
                 }
         except subprocess.TimeoutExpired:
             return {'success': False, 'error': 'Timeout ejecutando hdbsql'}
         except Exception as e:
             return {'success': False, 'error': f'Error ejecutando hdbsql: {str(e)}'}
+        finally:
+            # También ante timeout o error: el monitoreo no debe seguir consultando la tabla
+            stop_event.set()
+            if progress_thread:
+                progress_thread.join(timeout=2)
+            # Cerrar la línea de progreso para que la salida siguiente no la sobrescriba
+            printer.close()
+            if session:
+                session.close()
+            # Limpiar archivo temporal
+            if temp_sql_path:
+                try:
+                    os.unlink(temp_sql_path)
+                except OSError:
+                    pass
     
-    # Usar hdbcli (fallback)
-    if conn is None:
-        return {'success': False, 'error': 'No hay conexión disponible'}
+    return {'success': False, 'error': 'No hay conexión disponible'}
+
+
+def init_worker(config):
+    """Inicializa un proceso worker: abre su propia conexión hdbcli y silencia su salida"""
+    global WORKER_CONN
+    if dbapi is not None:
+        # Una conexión por worker, reutilizada por todos los archivos que procese
+        WORKER_CONN = connect_to_hana(config)
+        WORKER_CONN.setautocommit(False)
+        # Los workers terminan con os._exit (no ejecutan atexit): se cierra con un finalizador
+        # de multiprocessing, que sí se ejecuta al apagar el proceso
+        multiprocessing.util.Finalize(None, WORKER_CONN.close, exitpriority=10)
+    # La salida de cada archivo se captura y la muestra el proceso principal
+    sys.stdout = open(os.devnull, 'w')
+
+
+def execute_sql_file_worker(sql_file, log_dir, config):
+    """Ejecuta un archivo SQL en un proceso worker y retorna (resultado, duración, salida)"""
+    start_time = time.time()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        result = execute_sql_file(WORKER_CONN, sql_file, log_dir, config)
+    # De cada línea de progreso (reescrita con \r) se conserva solo el último estado
+    lines = [line.rsplit('\r', 1)[-1] for line in output.getvalue().split('\n')]
+    return result, int(time.time() - start_time), '\n'.join(line for line in lines if line.strip())
+
+
+def iter_sql_results(sql_files, conn, log_dir, config, workers):
+    """
+    Ejecuta los archivos SQL y genera (archivo, resultado, duración) para cada uno.
+    Con un solo worker se ejecutan en orden sobre la conexión recibida; con más,
+    cada archivo (una tabla distinta) se ejecuta en un proceso con su propia conexión.
+    """
+    total_files = len(sql_files)
     
-    cursor = conn.cursor()
+    if workers <= 1:
+        # En orden, el conteo final de un archivo es el inicial del siguiente sobre la misma
+        # tabla (en paralelo otro worker podría estar insertando en ella)
+        records_cache = {}
+        for idx, sql_file in enumerate(sql_files, 1):
+            print(f"{Colors.YELLOW}[{idx}/{total_files}] Procesando: {sql_file.name}{Colors.NC}")
+            start_time = time.time()
+            result = execute_sql_file(conn, sql_file, log_dir, config, records_cache)
+            yield sql_file, result, int(time.time() - start_time)
+        return
     
-    try:
-        # Leer el contenido del archivo SQL
-        with open(sql_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            sql_content = f.read()
-        
-        if not sql_content.strip():
-            return {'success': False, 'error': 'Archivo vacío', 'skipped': True}
-        
-        # Dividir en statements individuales (separados por ;)
-        statements = [s.strip() for s in sql_content.split(';') 
-                     if s.strip() and not s.strip().startswith('--')]
-        
-        if not statements:
-            return {'success': False, 'error': 'No se encontraron statements SQL válidos', 'skipped': True}
-        
-        executed_count = 0
-        errors = []
-        output_lines = []
-        
-        for idx, statement in enumerate(statements, 1):
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(config,)) as executor:
+        futures = {
+            executor.submit(execute_sql_file_worker, sql_file, log_dir, config): sql_file
+            for sql_file in sql_files
+        }
+        for idx, future in enumerate(as_completed(futures), 1):
+            sql_file = futures[future]
+            print(f"{Colors.YELLOW}[{idx}/{total_files}] Completado: {sql_file.name}{Colors.NC}")
             try:
-                cursor.execute(statement)
-                executed_count += 1
-                try:
-                    results = cursor.fetchall()
-                    if results:
-                        output_lines.append(f"Statement {idx}: {len(results)} filas afectadas")
-                except:
-                    output_lines.append(f"Statement {idx}: Ejecutado correctamente")
+                result, duration, output = future.result()
             except Exception as e:
-                error_msg = f"Error en statement {idx}: {str(e)}"
-                errors.append(error_msg)
-                with open(error_log_path, 'a', encoding='utf-8') as err_file:
-                    err_file.write(f"{error_msg}\nStatement: {statement[:200]}...\n\n")
-        
-        conn.commit()
-        
-        with open(output_log_path, 'w', encoding='utf-8') as out_file:
-            out_file.write('\n'.join(output_lines))
-        
-        if errors:
-            return {
-                'success': False,
-                'error': f'{len(errors)} errores de {len(statements)} statements',
-                'executed': executed_count,
-                'total': len(statements)
-            }
-        
-        return {
-            'success': True,
-            'executed': executed_count,
-            'total': len(statements)
-        }
-        
-    except Exception as e:
-        with open(error_log_path, 'w', encoding='utf-8') as err_file:
-            err_file.write(f"Error fatal: {str(e)}\n")
-        return {'success': False, 'error': str(e)}
-    finally:
-        cursor.close()
+                result, duration, output = {'success': False, 'error': f'Error en worker: {e}'}, 0, ''
+            # Toda la salida del archivo en una sola escritura, sin intercalarse con otros workers
+            if output:
+                sys.stdout.write(output + '\n')
+            yield sql_file, result, duration
 
 
-def move_to_created(file_path, script_dir):
-    """Mueve un archivo a la carpeta created/"""
-    import os
-    created_dir_name = os.environ.get('CREATED_DIR', 'created')
-    created_dir = script_dir / created_dir_name
-    created_dir.mkdir(exist_ok=True)
-    
+def hash_file(file_path):
+    """Calcula el sha256 de un archivo leyéndolo por bloques"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(SQL_READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_processed_manifest(manifest_path):
+    """Carga las entradas <sha256>:<archivo> de los archivos ya ejecutados correctamente"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def move_to_created(file_path, created_dir):
+    """Mueve un archivo a la carpeta created/ (que ya debe existir)"""
     dest_path = created_dir / file_path.name
-    file_path.rename(dest_path)
+    try:
+        os.replace(file_path, dest_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Entre sistemas de archivos distintos no se puede renombrar: copiar y eliminar
+        shutil.move(str(file_path), str(dest_path))
     return dest_path
 
 
 def main():
     """Función principal"""
-    import os
     # Directorio del script (schema_to_cap)
-    script_dir = Path(__file__).parent
+    script_dir = SCRIPT_DIR
     # Directorio base (padre de schema_to_cap)
     base_dir = Path(os.environ.get('PROJECT_BASE_DIR', script_dir.parent))
     # Directorio de archivos SQL (configurable, dentro de schema_to_cap)
@@ -652,8 +1169,13 @@ def main():
         sql_files = [sql_file]
         single_file = True
     else:
-        # Ejecutar todos los archivos SQL en data_insert_sql/
-        sql_files = sorted([f for f in sql_dir.glob("*.sql")])
+        # Ejecutar todos los archivos SQL en data_insert_sql/ (scandir usa el tipo cacheado
+        # de cada entrada, sin un stat por archivo)
+        with os.scandir(sql_dir) as entries:
+            sql_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith('.sql') and entry.is_file(follow_symlinks=False)
+            )
         single_file = False
     
     if not sql_files:
@@ -663,7 +1185,9 @@ def main():
     print(f"{Colors.YELLOW}=== Iniciando ejecución de scripts SQL en SAP HANA ==={Colors.NC}")
     
     # Cargar configuración
-    config = load_config()
+    # Copia propia: load_config está cacheada y main agrega claves internas
+    config = dict(load_config())
+    config['_SCHEMA'] = derive_schema(config['HANA_USER'])
     print(f"Servidor: {config['HANA_HOST']}:{config['HANA_PORT']}")
     print(f"Base de datos: {config['HANA_DATABASE']}")
     print(f"Usuario: {config['HANA_USER']}")
@@ -675,6 +1199,32 @@ def main():
     log_dir = script_dir / log_dir_name
     log_dir.mkdir(exist_ok=True)
     
+    # Con SKIP_PROCESSED se omiten los archivos ejecutados correctamente en una ejecución
+    # anterior con el mismo contenido (permite retomar una ejecución interrumpida)
+    manifest_path = log_dir / PROCESSED_MANIFEST
+    file_hashes = {}
+    skip_processed = not single_file and config_flag(config, 'SKIP_PROCESSED')
+    if skip_processed:
+        processed = load_processed_manifest(manifest_path)
+        pending_files = []
+        for sql_file in sql_files:
+            file_hashes[sql_file] = hash_file(sql_file)
+            if f"{file_hashes[sql_file]}:{sql_file.name}" not in processed:
+                pending_files.append(sql_file)
+        if len(pending_files) < len(sql_files):
+            print(f"{Colors.BLUE}Omitiendo {len(sql_files) - len(pending_files)} archivos ya ejecutados ({PROCESSED_MANIFEST}){Colors.NC}")
+        sql_files = pending_files
+        if not sql_files:
+            print(f"{Colors.GREEN}✓ Todos los archivos SQL ya fueron ejecutados{Colors.NC}")
+            sys.exit(0)
+    
+    # Los archivos exitosos se mueven a created/ en modo archivo único o con MOVE_ALL_ON_SUCCESS
+    move_all = config_flag(config, 'MOVE_ALL_ON_SUCCESS')
+    created_dir = script_dir / created_dir_name
+    if single_file or move_all:
+        created_dir.mkdir(exist_ok=True)
+    succeeded_files = []
+    
     error_log = log_dir / "errors.log"
     success_log = log_dir / "success.log"
     execution_log = log_dir / "execution.log"
@@ -684,22 +1234,44 @@ def main():
         if log_file.exists():
             log_file.write_text("")
     
-    # Verificar si usamos hdbsql primero (preferido para HANA Cloud)
-    hdbsql_path = find_hdbsql_path(config)
-    
-    # Si no se encuentra hdbsql, mostrar error claro
-    if not hdbsql_path:
-        print(f"{Colors.RED}Error: No se encontró el cliente HANA (hdbsql){Colors.NC}")
-        print(f"\n{Colors.YELLOW}El cliente HANA es requerido para ejecutar los scripts SQL.{Colors.NC}")
-        print(f"\n{Colors.BLUE}Opciones:{Colors.NC}")
-        print(f"  1. Agregar hdbsql al PATH del sistema")
-        print(f"  2. Configurar HANA_CLIENT_PATH en hana_config.conf apuntando al binario hdbsql")
-        sys.exit(1)
-    
-    print(f"{Colors.GREEN}✓ Usando hdbsql para ejecución: {hdbsql_path}{Colors.NC}\n")
+    # Archivos ejecutados en paralelo (cada uno apunta a una tabla distinta)
+    try:
+        workers = int(config.get('SQL_WORKERS') or DEFAULT_SQL_WORKERS)
+    except ValueError:
+        workers = DEFAULT_SQL_WORKERS
+    workers = max(1, min(workers, len(sql_files)))
     
-    # No necesitamos hdbcli si tenemos hdbsql
     conn = None
+    if dbapi is not None:
+        # Conexión persistente: un solo handshake TLS/autenticación para todos los archivos.
+        # Se abre siempre aquí para detectar un error de conexión una sola vez, con su mensaje;
+        # en paralelo solo valida la configuración y cada worker abre la suya al iniciar
+        conn = connect_to_hana(config)
+        if workers == 1:
+            conn.setautocommit(False)
+        else:
+            conn.close()
+            conn = None
+        print(f"{Colors.GREEN}✓ Usando conexión hdbcli persistente{Colors.NC}")
+    else:
+        hdbsql_path = find_hdbsql_path(config)
+        
+        # Si no se encuentra hdbsql, mostrar error claro
+        if not hdbsql_path:
+            print(f"{Colors.RED}Error: No se encontró el cliente HANA (hdbsql){Colors.NC}")
+            print(f"\n{Colors.YELLOW}El cliente HANA es requerido para ejecutar los scripts SQL.{Colors.NC}")
+            print(f"\n{Colors.BLUE}Opciones:{Colors.NC}")
+            print(f"  1. Instalar hdbcli (pip install hdbcli)")
+            print(f"  2. Agregar hdbsql al PATH del sistema")
+            print(f"  3. Configurar HANA_CLIENT_PATH en hana_config.conf apuntando al binario hdbsql")
+            sys.exit(1)
+        
+        print(f"{Colors.GREEN}✓ Usando hdbsql para ejecución: {hdbsql_path}{Colors.NC}")
+        config['_HDBSQL_PATH'] = hdbsql_path
+    
+    if workers > 1:
+        print(f"{Colors.BLUE}Ejecutando {workers} archivos en paralelo{Colors.NC}")
+    print()
     
     # Contadores
     total_files = len(sql_files)
@@ -707,51 +1279,71 @@ def main():
     error_count = 0
     skipped_count = 0
     
-    # Procesar cada archivo
-    for idx, sql_file in enumerate(sql_files, 1):
-        filename = sql_file.name
-        print(f"{Colors.YELLOW}[{idx}/{total_files}] Procesando: {filename}{Colors.NC}")
-        
-        start_time = time.time()
-        result = execute_sql_file(conn, sql_file, log_dir, config)
-        duration = int(time.time() - start_time)
-        
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        if result.get('skipped'):
-            skipped_count += 1
-            print(f"  {Colors.YELLOW}⚠ Omitido: {result.get('error', '')}{Colors.NC}")
-            with open(execution_log, 'a', encoding='utf-8') as f:
-                f.write(f"[{timestamp}] SKIPPED: {filename} - {result.get('error', '')}\n")
-        elif result['success']:
-            success_count += 1
-            stats = f"({result.get('executed', 0)} statements)"
-            if 'records_inserted' in result:
-                stats += f" - {result['records_inserted']:,} registros insertados"
-            print(f"  {Colors.GREEN}✓ Éxito {stats} ({duration}s){Colors.NC}")
-            with open(success_log, 'a', encoding='utf-8') as f:
-                f.write(f"[{timestamp}] SUCCESS: {filename} - {stats} - {duration}s\n")
+    manifest_f = open(manifest_path, 'a', encoding='utf-8') if skip_processed else None
+    
+    # Procesar cada archivo (los logs se abren una sola vez para toda la ejecución y la
+    # salida de consola va con buffer, con un flush por archivo)
+    with open(error_log, 'a', encoding='utf-8') as err_f, \
+            open(success_log, 'a', encoding='utf-8') as succ_f, \
+            open(execution_log, 'a', encoding='utf-8') as exec_f, \
+            buffered_stdout():
+        for sql_file, result, duration in iter_sql_results(sql_files, conn, log_dir, config, workers):
+            filename = sql_file.name
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # Si es un solo archivo y fue exitoso, moverlo a created/
-            if single_file:
-                try:
-                    moved_to = move_to_created(sql_file, script_dir)
-                    print(f"  {Colors.GREEN}✓ Movido a: {moved_to}{Colors.NC}")
-                except Exception as e:
-                    print(f"  {Colors.YELLOW}⚠ No se pudo mover a created/: {e}{Colors.NC}")
-        else:
-            error_count += 1
-            print(f"  {Colors.RED}✗ Error: {result.get('error', '')} ({duration}s){Colors.NC}")
-            with open(error_log, 'a', encoding='utf-8') as f:
-                f.write(f"[{timestamp}] ERROR: {filename} - {result.get('error', '')} - {duration}s\n")
-        
-        with open(execution_log, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] {filename} - {result.get('error', 'SUCCESS')} - {duration}s\n")
+            if result.get('skipped'):
+                skipped_count += 1
+                print(f"  {Colors.YELLOW}⚠ Omitido: {result.get('error', '')}{Colors.NC}")
+                exec_f.write(f"[{timestamp}] SKIPPED: {filename} - {result.get('error', '')}\n")
+            elif result['success']:
+                success_count += 1
+                stats = f"({result.get('executed', 0)} statements)"
+                if 'records_inserted' in result:
+                    stats += f" - {result['records_inserted']:,} registros insertados"
+                print(f"  {Colors.GREEN}✓ Éxito {stats} ({duration}s){Colors.NC}")
+                succ_f.write(f"[{timestamp}] SUCCESS: {filename} - {stats} - {duration}s\n")
+                if manifest_f:
+                    manifest_f.write(f"{file_hashes[sql_file]}:{filename}\n")
+                    manifest_f.flush()
+                
+                # Si es un solo archivo y fue exitoso, moverlo a created/
+                if single_file:
+                    try:
+                        moved_to = move_to_created(sql_file, created_dir)
+                        print(f"  {Colors.GREEN}✓ Movido a: {moved_to}{Colors.NC}")
+                    except Exception as e:
+                        print(f"  {Colors.YELLOW}⚠ No se pudo mover a created/: {e}{Colors.NC}")
+                elif move_all:
+                    succeeded_files.append(sql_file)
+            else:
+                error_count += 1
+                print(f"  {Colors.RED}✗ Error: {result.get('error', '')} ({duration}s){Colors.NC}")
+                err_f.write(f"[{timestamp}] ERROR: {filename} - {result.get('error', '')} - {duration}s\n")
+            
+            exec_f.write(f"[{timestamp}] {filename} - {result.get('error', 'SUCCESS')} - {duration}s\n")
+            
+            # Mantener los logs y la consola al día aunque la ejecución se interrumpa
+            for log_f in (err_f, succ_f, exec_f, sys.stdout):
+                log_f.flush()
+    
+    if manifest_f:
+        manifest_f.close()
     
     # Cerrar conexión si existe
     if conn:
         conn.close()
     
+    # Mover todos los archivos exitosos a created/ de una vez
+    if succeeded_files:
+        moved_count = 0
+        for sql_file in succeeded_files:
+            try:
+                move_to_created(sql_file, created_dir)
+                moved_count += 1
+            except OSError as e:
+                print(f"{Colors.YELLOW}⚠ No se pudo mover {sql_file.name} a created/: {e}{Colors.NC}")
+        print(f"{Colors.GREEN}✓ {moved_count} archivos movidos a: {created_dir}{Colors.NC}")
+    
     # Resumen final
     print()
     print(f"{Colors.YELLOW}=== Resumen de ejecución ==={Colors.NC}")
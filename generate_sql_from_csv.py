@@ -7,21 +7,81 @@ Lee los datos de index/SCHEMA_NAME/ y genera archivos SQL compatibles con execut
 import os
 import sys
 import csv
+import io
+import itertools
+import multiprocessing.util
 import re
 import tarfile
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager, redirect_stdout, suppress
 from pathlib import Path
-from io import StringIO
-from utils import get_schema_name
+from utils import get_schema_name, open_tar_gz, read_file_bytes, USE_COLOR
+
+# indexed_gzip es opcional: si está instalado, las lecturas desde el tar.gz saltan directo
+# a cada archivo usando un índice de puntos de acceso en lugar de descomprimir desde el inicio
+try:
+    import indexed_gzip
+except ImportError:
+    indexed_gzip = None
 
 
 class Colors:
-    """Colores para output en terminal"""
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    YELLOW = '\033[1;33m'
-    BLUE = '\033[0;34m'
-    NC = '\033[0m'  # No Color
+    """Colores para output en terminal (vacíos si la salida no es una terminal o con NO_COLOR)"""
+    RED = '\033[0;31m' if USE_COLOR else ''
+    GREEN = '\033[0;32m' if USE_COLOR else ''
+    YELLOW = '\033[1;33m' if USE_COLOR else ''
+    BLUE = '\033[0;34m' if USE_COLOR else ''
+    NC = '\033[0m' if USE_COLOR else ''  # No Color
+
+
+# Prefijo del marcador (en el directorio de extracción) de un schema ya descomprimido
+EXTRACTED_MARKER_PREFIX = '.extracted_ok_'
+
+# Tamaño del buffer de escritura de los archivos SQL generados (1 MiB)
+SQL_WRITE_BUFFER_SIZE = 1 << 20
+
+# Índice del tar.gz propio de cada proceso worker (se inicializa en init_worker)
+WORKER_TAR_INDEX = None
+
+# Inicio del CREATE COLUMN TABLE hasta el paréntesis que abre las definiciones de columnas
+CREATE_TABLE_RE = re.compile(r'CREATE\s+COLUMN\s+TABLE\s+[^(]+\(', re.IGNORECASE)
+
+# Definiciones dentro de los paréntesis que son restricciones de la tabla y no columnas
+TABLE_CONSTRAINT_WORDS = frozenset({'PRIMARY', 'UNIQUE', 'CONSTRAINT', 'FOREIGN', 'CHECK'})
+
+
+def split_column_definitions(create_sql_content, start):
+    """
+    Divide las definiciones entre paréntesis del CREATE TABLE por las comas de primer nivel
+    Recorre el texto una sola vez desde start (después del paréntesis que abre), ignorando las
+    comas dentro de paréntesis (DECIMAL(10,2)), identificadores entre comillas dobles y literales
+    """
+    definitions = []
+    depth = 0
+    quote = None
+    piece_start = start
+    for idx in range(start, len(create_sql_content)):
+        char = create_sql_content[idx]
+        if quote:
+            # Una comilla duplicada ('' o "") cierra y vuelve a abrir: el resultado es el mismo
+            if char == quote:
+                quote = None
+        elif char == '"' or char == "'":
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            if depth == 0:
+                # Paréntesis que cierra las definiciones de columnas
+                definitions.append(create_sql_content[piece_start:idx])
+                return definitions
+            depth -= 1
+        elif char == ',' and depth == 0:
+            definitions.append(create_sql_content[piece_start:idx])
+            piece_start = idx + 1
+    definitions.append(create_sql_content[piece_start:])
+    return definitions
 
 
 def extract_column_names_from_create_sql(create_sql_content):
@@ -29,28 +89,24 @@ def extract_column_names_from_create_sql(create_sql_content):
     # Buscar el patrón: "COLUMN_NAME" TYPE o COLUMN_NAME TYPE
     # Ejemplo: CREATE COLUMN TABLE "SCHEMA"."TABLENAME" ("COLUMN" NVARCHAR(500), ...)
     
-    # Remover la parte del CREATE TABLE hasta el primer paréntesis
-    match = re.search(r'CREATE\s+COLUMN\s+TABLE\s+[^(]+\((.+)\)', create_sql_content, re.IGNORECASE | re.DOTALL)
+    # Ubicar el paréntesis que abre las definiciones de columnas
+    match = CREATE_TABLE_RE.search(create_sql_content)
     if not match:
         return None
     
-    columns_section = match.group(1)
-    
-    # Remover PRIMARY KEY y otras cláusulas al final
-    # Buscar hasta PRIMARY KEY, UNLOAD, AUTO, etc.
-    columns_section = re.split(r'\b(PRIMARY\s+KEY|UNLOAD|AUTO|MERGE)', columns_section, flags=re.IGNORECASE)[0]
-    
-    # Dividir por comas y procesar cada definición de columna
+    # Dividir por comas de primer nivel y tomar el nombre de cada definición de columna
     columns = []
-    # Patrón más preciso: "COLUMN_NAME" o COLUMN_NAME seguido de tipo de datos
-    # Tipos comunes: NVARCHAR, INTEGER, SECONDDATE, TIMESTAMP, etc.
-    column_pattern = r'["\']?([A-Z_$][A-Z0-9_$]*?)["\']?\s+(NVARCHAR|VARCHAR|INTEGER|INT|BIGINT|DECIMAL|DOUBLE|REAL|SECONDDATE|TIMESTAMP|DATE|TIME|BINARY|VARBINARY|BOOLEAN|TINYINT|SMALLINT|CLOB|NCLOB|BLOB)'
-    
-    matches = re.finditer(column_pattern, columns_section, re.IGNORECASE)
-    for match in matches:
-        col_name = match.group(1)
-        # Filtrar columnas del sistema y palabras reservadas
-        if not col_name.startswith('$') and col_name.upper() not in ['PRIMARY', 'KEY', 'INVERTED', 'VALUE', 'UNLOAD', 'PRIORITY', 'AUTO', 'MERGE']:
+    for definition in split_column_definitions(create_sql_content, match.end()):
+        definition = definition.strip()
+        if definition.startswith('"'):
+            col_name = definition[1:].split('"', 1)[0]
+        else:
+            col_name = definition.split(None, 1)[0] if definition else ''
+            # PRIMARY KEY, UNIQUE, etc. no son columnas
+            if col_name.upper() in TABLE_CONSTRAINT_WORDS:
+                continue
+        # Filtrar columnas del sistema
+        if col_name and not col_name.startswith('$'):
             columns.append(col_name)
     
     return columns if columns else None
@@ -65,56 +121,151 @@ def get_table_name_from_path(path):
     return None
 
 
-def read_csv_from_tar(tar_path, csv_path, extract_dir):
-    """Lee un archivo CSV desde archivos descomprimidos o desde tar.gz"""
+class TarIndex:
+    """
+    Acceso por nombre a los miembros del tar.gz para leer archivos que no están descomprimidos.
+    El tar se abre y se indexa una sola vez, recién en la primera lectura.
+    """
+    
+    def __init__(self, tar_path):
+        self.tar_path = tar_path
+        self._stack = ExitStack()
+        self._tar = None
+        self._members = None
+    
+    def extractfile(self, file_path):
+        """Retorna el archivo (binario) de un miembro del tar, o None si no existe o está vacío"""
+        if self._tar is None:
+            self._tar = self._open_tar()
+            self._members = {member.name: member for member in self._tar.getmembers()}
+        member = self._members.get(file_path)
+        if member is None or not member.size:
+            return None
+        return self._tar.extractfile(member)
+    
+    def _open_tar(self):
+        """Abre el tar.gz con acceso aleatorio (con indexed_gzip si está disponible)"""
+        if indexed_gzip is None:
+            return self._stack.enter_context(open_tar_gz(self.tar_path, 'r:gz'))
+        
+        gz_file = self._stack.enter_context(self._open_indexed_gzip())
+        return self._stack.enter_context(tarfile.open(fileobj=gz_file, mode='r:'))
+    
+    def _open_indexed_gzip(self):
+        """
+        Abre el tar.gz con indexed_gzip. El índice se guarda junto al tar.gz y se reutiliza
+        mientras el tar.gz no cambie; si no se puede importar, se vuelve a construir
+        """
+        index_path = Path(f"{self.tar_path}.gzi")
+        if index_path.exists() and index_path.stat().st_mtime >= Path(self.tar_path).stat().st_mtime:
+            gz_file = indexed_gzip.IndexedGzipFile(str(self.tar_path))
+            try:
+                gz_file.import_index(str(index_path))
+                return gz_file
+            except Exception:
+                # Índice corrupto o incompleto
+                gz_file.close()
+        
+        gz_file = indexed_gzip.IndexedGzipFile(str(self.tar_path))
+        try:
+            gz_file.build_full_index()
+        except BaseException:
+            gz_file.close()
+            raise
+        self._export_index(gz_file, index_path)
+        return gz_file
+    
+    @staticmethod
+    def _export_index(gz_file, index_path):
+        """
+        Guarda el índice en un archivo temporal y lo reemplaza de forma atómica:
+        cada worker puede construirlo a la vez sin dejar un índice a medio escribir
+        """
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=index_path.parent, prefix=f"{index_path.name}.", suffix='.tmp')
+        except OSError:
+            # Sin permisos de escritura: el índice solo se usa en esta ejecución
+            return
+        os.close(fd)
+        try:
+            gz_file.export_index(temp_path)
+            os.replace(temp_path, index_path)
+        except Exception:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+    
+    def close(self):
+        """Cierra el tar si se llegó a abrir"""
+        self._stack.close()
+        self._tar = None
+        self._members = None
+
+
+@contextmanager
+def read_csv_from_tar(tar_index, csv_path, extract_dir):
+    """
+    Abre un archivo CSV como texto para leerlo por líneas, desde archivos descomprimidos
+    o desde tar.gz. Entrega None si no existe o está vacío.
+    """
     # Primero intentar leer desde archivos descomprimidos
-    csv_content = read_file_from_extracted(extract_dir, csv_path)
-    if csv_content is not None:
-        return csv_content
+    full_path = extract_dir / csv_path
+    if full_path.exists():
+        if full_path.stat().st_size == 0:
+            yield None
+        else:
+            with open(full_path, 'r', encoding='utf-8', errors='ignore', newline='') as csv_file:
+                yield csv_file
+        return
     
     # Si no está descomprimido, leer desde tar.gz
     try:
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            member = tar.getmember(csv_path)
-            if member:
-                file_obj = tar.extractfile(member)
-                if file_obj:
-                    # Leer como texto
-                    content = file_obj.read().decode('utf-8', errors='ignore')
-                    return content
-    except Exception as e:
+        file_obj = tar_index.extractfile(csv_path)
+    except (OSError, tarfile.TarError):
+        file_obj = None
+    if not file_obj:
         # Si el archivo no existe en el tar, puede ser que el CSV esté vacío
-        pass
-    return None
+        yield None
+        return
+    # Decodificar por bloques a medida que el csv.reader consume líneas
+    with io.TextIOWrapper(file_obj, encoding='utf-8', errors='ignore', newline='') as csv_file:
+        yield csv_file
 
 
-def check_files_already_extracted(extract_dir, schema_name):
-    """Verifica si los archivos CSV ya están descomprimidos"""
-    # Verificar si existe el directorio base
-    index_dir = extract_dir / "index" / schema_name
-    if not index_dir.exists():
-        return False
-    
-    # Contar cuántos archivos data.csv deberían existir
-    csv_files = list(index_dir.rglob("data.csv"))
-    
-    # Si hay menos de 100 archivos, probablemente no están todos
-    if len(csv_files) < 100:
-        return False
+def get_extracted_marker_path(extract_dir, schema_name):
+    """Ruta del marcador que registra los CSV descomprimidos del schema"""
+    return extract_dir / f"{EXTRACTED_MARKER_PREFIX}{schema_name}"
+
+
+def check_files_already_extracted(tar_path, extract_dir, schema_name):
+    """
+    Verifica si los archivos CSV ya están descomprimidos
+    Retorna la lista de CSV registrada en el marcador, o None si hay que descomprimir
+    """
+    marker_path = get_extracted_marker_path(extract_dir, schema_name)
+    try:
+        # Un export.tar.gz más nuevo que el marcador se vuelve a descomprimir
+        if marker_path.stat().st_mtime < Path(tar_path).stat().st_mtime:
+            return None
+        with open(marker_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
     
-    return True
+    # Primera línea: cantidad de CSV; un marcador incompleto no se considera válido
+    if not lines or not lines[0].isdigit() or int(lines[0]) != len(lines) - 1:
+        return None
+    return lines[1:]
 
 
-def read_file_from_tar(tar_path, file_path):
-    """Lee un archivo desde un tar.gz"""
+def read_file_from_tar(tar_index, file_path):
+    """Lee un archivo desde el tar.gz indexado"""
     try:
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            member = tar.getmember(file_path)
-            if member:
-                file_obj = tar.extractfile(member)
-                if file_obj:
-                    return file_obj.read().decode('utf-8', errors='ignore')
-    except Exception as e:
+        file_obj = tar_index.extractfile(file_path)
+        if file_obj:
+            return file_obj.read().decode('utf-8', errors='ignore')
+    except (OSError, tarfile.TarError):
         pass
     return None
 
@@ -123,64 +274,53 @@ def read_file_from_extracted(extract_dir, file_path):
     """Lee un archivo desde el directorio descomprimido"""
     full_path = extract_dir / file_path
     if full_path.exists():
-        return full_path.read_text(encoding='utf-8', errors='ignore')
+        return read_file_bytes(full_path).decode('utf-8', errors='ignore')
     return None
 
 
-def escape_sql_value(value):
-    """Escapa un valor para SQL (reemplaza comillas simples)"""
-    if value is None:
-        return 'NULL'
-    # Convertir a string y escapar comillas simples
-    str_value = str(value)
-    # Reemplazar comillas simples por dos comillas simples (SQL escape)
-    str_value = str_value.replace("'", "''")
-    return f"'{str_value}'"
-
-
-def generate_insert_statements(table_name, columns, csv_content):
-    """Genera INSERT statements desde el contenido CSV"""
+def generate_insert_statements(table_name, columns, csv_file, out_file):
+    """Escribe en out_file los INSERT statements de las filas de csv_file y retorna la cantidad de filas"""
     if not columns:
         return None
     
-    # Leer CSV
-    csv_reader = csv.reader(StringIO(csv_content))
+    # Leer CSV por líneas, sin cargar el archivo completo
+    csv_reader = csv.reader(csv_file)
+    
+    # Encabezado del script
+    out_file.write(f"-- Script SQL generado automáticamente\n")
+    out_file.write(f"-- Tabla: DB_{table_name}\n")
+    out_file.write(f"-- Archivo CSV origen: {table_name}.csv\n")
+    
+    # Prefijo común a todos los INSERT de la tabla, armado una sola vez
+    # Formato: INSERT INTO DB_TABLENAME ("COL1", "COL2", ...) VALUES ('val1', 'val2', ...);
+    columns_str = ', '.join([f'"{col}"' for col in columns])
+    insert_prefix = f"\nINSERT INTO DB_{table_name} ({columns_str}) VALUES ('"
     
-    # Generar INSERT statements
-    insert_statements = []
-    insert_statements.append(f"-- Script SQL generado automáticamente")
-    insert_statements.append(f"-- Tabla: DB_{table_name}")
-    insert_statements.append(f"-- Archivo CSV origen: {table_name}.csv")
-    insert_statements.append("")
+    column_count = len(columns)
+    # Valores vacíos para completar las filas con menos columnas
+    empty_values = [''] * column_count
     
     row_count = 0
     for row in csv_reader:
         if not row:  # Saltar filas vacías
             continue
         
-        # Asegurar que tenemos suficientes valores
-        while len(row) < len(columns):
-            row.append('')
+        # Asegurar que tenemos suficientes valores (en una sola operación)
+        if len(row) < column_count:
+            row += empty_values[len(row):]
         
         # Tomar solo los valores que corresponden a las columnas
-        values = row[:len(columns)]
+        values = row[:column_count]
         
-        # Crear la lista de valores escapados
-        escaped_values = [escape_sql_value(val) for val in values]
-        
-        # Crear el INSERT statement
-        # Formato: INSERT INTO DB_TABLENAME ("COL1", "COL2", ...) VALUES ('val1', 'val2', ...);
-        columns_str = ', '.join([f'"{col}"' for col in columns])
-        values_str = ', '.join(escaped_values)
-        
-        insert_stmt = f"INSERT INTO DB_{table_name} ({columns_str}) VALUES ({values_str});"
-        insert_statements.append(insert_stmt)
+        # Escapar comillas simples (SQL escape) y crear el INSERT statement
+        values_str = "', '".join([val.replace("'", "''") for val in values])
+        out_file.write(insert_prefix + values_str + "');")
         row_count += 1
     
-    return '\n'.join(insert_statements), row_count
+    return row_count
 
 
-def process_table(tar_path, table_path, output_dir, extract_dir):
+def process_table(tar_index, table_path, output_dir, extract_dir):
     """Procesa una tabla: lee CSV y genera SQL"""
     table_name = get_table_name_from_path(table_path)
     if not table_name:
@@ -193,7 +333,7 @@ def process_table(tar_path, table_path, output_dir, extract_dir):
     # Leer create.sql (desde descomprimido o tar.gz)
     create_sql_content = read_file_from_extracted(extract_dir, create_sql_path)
     if not create_sql_content:
-        create_sql_content = read_file_from_tar(tar_path, create_sql_path)
+        create_sql_content = read_file_from_tar(tar_index, create_sql_path)
     
     if not create_sql_content:
         print(f"  {Colors.YELLOW}⚠ No se encontró create.sql para {table_name}{Colors.NC}")
@@ -205,35 +345,63 @@ def process_table(tar_path, table_path, output_dir, extract_dir):
         print(f"  {Colors.YELLOW}⚠ No se pudieron extraer columnas de {table_name}{Colors.NC}")
         return None, 0
     
-    # Leer CSV (desde descomprimido o tar.gz)
-    csv_content = read_csv_from_tar(tar_path, csv_path, extract_dir)
-    if not csv_content:
-        print(f"  {Colors.YELLOW}⚠ No se encontró data.csv para {table_name}{Colors.NC}")
-        return None, 0
-    
-    # Generar INSERT statements
-    sql_content, row_count = generate_insert_statements(table_name, columns, csv_content)
+    # Leer CSV (desde descomprimido o tar.gz) y escribir el SQL a medida que se lee
+    output_file = output_dir / f"{table_name}.sql"
+    # Se escribe a un archivo temporal: un error a mitad de tabla no deja un .sql incompleto
+    partial_file = output_dir / f"{table_name}.sql.partial"
+    with read_csv_from_tar(tar_index, csv_path, extract_dir) as csv_file:
+        if not csv_file:
+            print(f"  {Colors.YELLOW}⚠ No se encontró data.csv para {table_name}{Colors.NC}")
+            return None, 0
+        
+        # Generar INSERT statements
+        try:
+            with open(partial_file, 'w', encoding='utf-8', buffering=SQL_WRITE_BUFFER_SIZE) as out_file:
+                row_count = generate_insert_statements(table_name, columns, csv_file, out_file)
+        except BaseException:
+            # Si falló el propio open() no hay archivo parcial: se propaga el error original
+            with suppress(FileNotFoundError):
+                partial_file.unlink()
+            raise
     
     # Guardar archivo SQL
-    output_file = output_dir / f"{table_name}.sql"
-    output_file.write_text(sql_content, encoding='utf-8')
+    os.replace(partial_file, output_file)
     
     return output_file, row_count
 
 
+def init_worker(tar_path):
+    """Inicializa un proceso worker con su propio índice del tar.gz"""
+    global WORKER_TAR_INDEX
+    WORKER_TAR_INDEX = TarIndex(tar_path)
+    # Los workers terminan con os._exit (no ejecutan atexit): se cierra con un finalizador
+    # de multiprocessing, que sí se ejecuta al apagar el proceso
+    multiprocessing.util.Finalize(None, WORKER_TAR_INDEX.close, exitpriority=10)
+
+
+def process_table_worker(table_path, output_dir, extract_dir):
+    """
+    Procesa una tabla en un proceso worker y retorna (archivo, registros, salida, error)
+    La salida se captura para que el proceso principal la muestre en orden
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            output_file, row_count = process_table(WORKER_TAR_INDEX, table_path, output_dir, extract_dir)
+            error = None
+        except Exception as e:
+            output_file, row_count, error = None, 0, str(e)
+    return output_file, row_count, output.getvalue(), error
+
+
 def extract_files_from_tar(tar_path, extract_dir, schema_name):
     """Extrae los archivos CSV y create.sql necesarios del tar.gz (si no están ya descomprimidos)"""
     schema_path = f'index/{schema_name}/'
     
-    # Verificar si ya están descomprimidos
-    if check_files_already_extracted(extract_dir, schema_name):
+    # Verificar si ya están descomprimidos (sin recorrer el directorio)
+    csv_files = check_files_already_extracted(tar_path, extract_dir, schema_name)
+    if csv_files is not None:
         print(f"{Colors.BLUE}Archivos ya descomprimidos, usando existentes...{Colors.NC}")
-        # Listar archivos CSV existentes
-        csv_files = []
-        index_dir = extract_dir / "index" / schema_name
-        for csv_file in index_dir.rglob("data.csv"):
-            rel_path = csv_file.relative_to(extract_dir)
-            csv_files.append(str(rel_path))
         print(f"  {Colors.GREEN}✓ Encontrados {len(csv_files)} archivos CSV{Colors.NC}\n")
         return csv_files
     
@@ -241,17 +409,27 @@ def extract_files_from_tar(tar_path, extract_dir, schema_name):
     
     extracted_files = []
     csv_files = []
+    
+    def select_members(tar):
+        """Archivos CSV y create.sql de index/SCHEMA_NAME/, en el orden del tar"""
+        for member in tar:
+            if schema_path in member.name:
+                if member.name.endswith('/data.csv') or member.name.endswith('/create.sql'):
+                    extracted_files.append(member.name)
+                    if member.name.endswith('/data.csv'):
+                        csv_files.append(member.name)
+                    yield member
+    
+    # Filtro 'data' de tarfile (rutas y permisos seguros) si la versión de Python lo incluye
+    extract_options = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
     try:
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            for member in tar.getmembers():
-                # Extraer archivos CSV y create.sql de index/SCHEMA_NAME/
-                if schema_path in member.name:
-                    if member.name.endswith('/data.csv') or member.name.endswith('/create.sql'):
-                        # Extraer archivo
-                        tar.extract(member, extract_dir)
-                        extracted_files.append(member.name)
-                        if member.name.endswith('/data.csv'):
-                            csv_files.append(member.name)
+        with open_tar_gz(tar_path) as tar:
+            # Una sola llamada a extractall sobre el recorrido en streaming del tar
+            tar.extractall(extract_dir, members=select_members(tar), **extract_options)
+        # Marcador con los CSV extraídos para no volver a descomprimir en la próxima ejecución
+        marker_path = get_extracted_marker_path(extract_dir, schema_name)
+        with open(marker_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join([str(len(csv_files))] + csv_files) + '\n')
         print(f"  {Colors.GREEN}✓ Extraídos {len(extracted_files)} archivos ({len(csv_files)} CSV){Colors.NC}\n")
         return csv_files
     except Exception as e:
@@ -312,22 +490,30 @@ def main():
     error_count = 0
     total_rows = 0
     
-    for idx, table_path in enumerate(sorted(table_paths), 1):
-        table_name = get_table_name_from_path(table_path)
-        print(f"{Colors.YELLOW}[{idx}/{len(table_paths)}] Procesando: {table_name}{Colors.NC}")
-        
-        try:
-            output_file, row_count = process_table(tar_path, table_path, output_dir, extract_dir)
-            if output_file:
+    # Las tablas son independientes: se procesan en paralelo (los archivos que no estén
+    # descomprimidos se leen del tar.gz, indexado una sola vez por worker) y se reportan en orden
+    table_paths = sorted(table_paths)
+    with ProcessPoolExecutor(initializer=init_worker, initargs=(tar_path,)) as executor:
+        results = executor.map(
+            process_table_worker, table_paths, itertools.repeat(output_dir), itertools.repeat(extract_dir)
+        )
+        for idx, (table_path, result) in enumerate(zip(table_paths, results), 1):
+            table_name = get_table_name_from_path(table_path)
+            print(f"{Colors.YELLOW}[{idx}/{len(table_paths)}] Procesando: {table_name}{Colors.NC}")
+            
+            output_file, row_count, output, error = result
+            if output:
+                sys.stdout.write(output)
+            if error is not None:
+                error_count += 1
+                print(f"  {Colors.RED}✗ Error: {error}{Colors.NC}")
+            elif output_file:
                 success_count += 1
                 total_rows += row_count
                 print(f"  {Colors.GREEN}✓ Generado: {output_file.name} ({row_count:,} registros){Colors.NC}")
             else:
                 error_count += 1
                 print(f"  {Colors.RED}✗ Error generando SQL{Colors.NC}")
-        except Exception as e:
-            error_count += 1
-            print(f"  {Colors.RED}✗ Error: {str(e)}{Colors.NC}")
     
     # Resumen
     print()
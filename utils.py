@@ -4,18 +4,84 @@ Utilidades compartidas para los scripts
 """
 
 import os
+import sys
 import tarfile
+from contextlib import contextmanager
 from pathlib import Path
 
 
+# Colores ANSI solo si la salida es una terminal y no se definió NO_COLOR (https://no-color.org)
+USE_COLOR = sys.stdout.isatty() and 'NO_COLOR' not in os.environ
+
+# Tamaño del buffer de lectura del tar.gz (1 MiB): reduce syscalls al descomprimir
+TAR_READ_BUFFER_SIZE = 1 << 20
+
+
+@contextmanager
+def open_tar_gz(tar_path, mode='r|gz'):
+    """
+    Abre el tar.gz sobre un lector con buffer grande
+    Por defecto en modo streaming ('r|gz'), que recorre el archivo en una sola pasada
+    """
+    with open(tar_path, 'rb', buffering=TAR_READ_BUFFER_SIZE) as fileobj:
+        with tarfile.open(fileobj=fileobj, mode=mode, bufsize=TAR_READ_BUFFER_SIZE) as tar:
+            # Buffer de copia de extract/extractall (16 KiB por defecto; Python < 3.8 lo ignora)
+            tar.copybufsize = TAR_READ_BUFFER_SIZE
+            yield tar
+
+
+@contextmanager
+def buffered_stdout():
+    """
+    Desactiva el line buffering de stdout durante el bloque (sin flush por cada print)
+    y hace un único flush al salir
+    """
+    stream = sys.stdout
+    reconfigure = getattr(stream, 'reconfigure', None)
+    line_buffering = getattr(stream, 'line_buffering', False)
+    if reconfigure:
+        reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        stream.flush()
+        if reconfigure:
+            reconfigure(line_buffering=line_buffering)
+
+
+def read_file_bytes(file_path):
+    """
+    Lee un archivo completo con os.open + os.read
+    Evita las capas de io de Path.read_bytes (ventaja en muchos archivos pequeños)
+    """
+    flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(file_path, flags | getattr(os, 'O_NOATIME', 0))
+    except PermissionError:
+        # O_NOATIME solo está permitido al dueño del archivo
+        fd = os.open(file_path, flags)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # os.read puede devolver menos bytes en archivos muy grandes
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+    finally:
+        os.close(fd)
+
+
 def detect_schema_from_tar(tar_path):
     """
     Detecta automáticamente el nombre del schema desde el export.tar.gz
     Busca en la estructura index/SCHEMA_NAME/
     """
     try:
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            for member in tar.getmembers():
+        with open_tar_gz(tar_path) as tar:
+            for member in tar:
                 if member.name.startswith('index/') and '/' in member.name[6:]:
                     # Extraer schema de la ruta: index/SCHEMA_NAME/...
                     parts = member.name.split('/')